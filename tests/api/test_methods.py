@@ -12,21 +12,22 @@ pytestmark = [allure.suite("Allowed methods tests")]
 
 
 @pytest.fixture(params=get_data_for_methods_check())
-def prepare_data(request, app_fs):
+def prepare_data(request, seeded_app_fs):
     """
     Generate request body here since it depends on actual APP instance
     and can't be determined when generating
+    APP is started with pre-seeded objects, so there is no need to create them
     """
     test_data_list: List[TestData] = request.param
     for test_data in test_data_list:
-        request_data = DbFiller(app=app_fs).generate_valid_request_data(
+        request_data = DbFiller(app=seeded_app_fs).generate_valid_request_data(
             endpoint=test_data.request.endpoint, method=test_data.request.method
         )
 
         test_data.request.data = request_data["data"]
         test_data.request.object_id = request_data.get("object_id")
 
-    return app_fs, test_data_list
+    return seeded_app_fs, test_data_list
 
 
 def test_methods(prepare_data):
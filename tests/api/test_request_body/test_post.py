@@ -1,6 +1,5 @@
 """APP API POST body tests"""
 from typing import List
-from copy import deepcopy
 
 import allure
 import pytest
@@ -11,11 +10,11 @@ from tests.test_data.generators import (
     TestData,
     TestDataWithPreparedBody,
 )
+from tests.test_data.body_builder import get_body_builder
 from tests.test_data.db_filler import DbFiller
 
 from tests.utils.methods import Methods
-from tests.utils.types import get_fields
-from tests.utils.api_objects import APPApi
+from tests.utils.api_objects import APPApi, AsyncAPPApi
 
 
 pytestmark = [
@@ -24,32 +23,22 @@ pytestmark = [
 
 
 @pytest.fixture()
-def prepare_post_body_data(request, app_fs: APPApi):
+def prepare_post_body_data(request, app_fs: APPApi, db_filler: DbFiller):
     """
     Fixture for preparing test data for POST request, depending on generated test datasets
     """
     test_data_list: List[TestDataWithPreparedBody] = request.param
-    valid_request_data = DbFiller(app=app_fs).generate_valid_request_data(
+    valid_request_data = db_filler.generate_valid_request_data(
         endpoint=test_data_list[0].test_data.request.endpoint, method=Methods.POST
     )
+    body_builder = get_body_builder(test_data_list[0].test_data.request.endpoint)
     final_test_data_list: List[TestData] = []
     for test_data_with_prepared_values in test_data_list:
         test_data, prepared_field_values = test_data_with_prepared_values
-        test_data.request.data = deepcopy(valid_request_data["data"])
-        for field in get_fields(test_data.request.endpoint.data_class):
-            if field.name in prepared_field_values:
-                if not prepared_field_values[field.name].drop_key:
-
-                    valid_field_value = None
-                    if field.name in test_data.request.data:
-                        valid_field_value = test_data.request.data[field.name]
-                    test_data.request.data[field.name] = prepared_field_values[
-                        field.name
-                    ].return_value(valid_field_value)
-
-                else:
-                    if field.name in test_data.request.data:
-                        del test_data.request.data[field.name]
+        test_data.request.data = body_builder.build(
+            valid_body=valid_request_data["data"],
+            prepared_values=prepared_field_values,
+        )
         final_test_data_list.append(test_data)
 
     return app_fs, final_test_data_list
@@ -81,8 +70,14 @@ def test_post_body_negative(prepare_post_body_data):
     nullable and required if not possible, fields with incorrect types etc.
     """
     app, test_data_list = prepare_post_body_data
-    for test_data in test_data_list:
-        with allure.step(title=f"Assert - {test_data.description}"):
-            app.exec_request(
-                request=test_data.request, expected_response=test_data.response
-            )
+    # Negative requests are rejected by validation, so they are independent
+    # and can be sent concurrently
+    with AsyncAPPApi(app) as async_api:
+        async_api.exec_requests(
+            batch=[
+                (test_data.request, test_data.response) for test_data in test_data_list
+            ],
+            step_titles=[
+                f"Assert - {test_data.description}" for test_data in test_data_list
+            ],
+        )
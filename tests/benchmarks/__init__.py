@@ -0,0 +1,4 @@
+"""
+Benchmarks for test framework internals
+Run them as modules from repository root, ex: python -m tests.benchmarks.bench_transport
+"""
@@ -0,0 +1,80 @@
+"""
+Measure per-request overhead of APPApi excluding I/O: URL building,
+allure step and response checks around a canned response.
+Previous URL building with str.format and step name building on each request
+are measured for comparison
+"""
+import time
+from urllib.parse import urlencode
+
+from requests import Response
+
+from tests.utils.api_objects import APPApi, ExpectedResponse, Request
+from tests.utils.endpoints import Endpoints
+from tests.utils.methods import Methods
+
+REQUESTS_COUNT = 100_000
+
+
+class _NoIOApi(APPApi):
+    """APPApi that returns canned response instead of sending request"""
+
+    __slots__ = ("_response",)
+
+    def __init__(self, response: Response):
+        super().__init__()
+        self._response = response
+
+    def send(self, request: Request) -> Response:
+        self.get_url_for_endpoint(
+            endpoint=request.endpoint,
+            method=request.method,
+            object_id=request.object_id,
+        )
+        return self._response
+
+
+def _legacy_url_and_step_name(api: APPApi, request: Request) -> str:
+    url_template = request.method.url_template
+    if "{id}" in url_template:
+        url = url_template.format(name=request.endpoint.path, id=request.object_id)
+    else:
+        url = url_template.format(name=request.endpoint.path)
+    url = f"{api._base_url}{url}"
+    step_name = f"Send {request.method.name} {url.replace(api._base_url, '')}"
+    if request.url_params:
+        step_name += f"?{urlencode(request.url_params)}"
+    return step_name
+
+
+def _per_request_us(func) -> float:
+    start = time.perf_counter()
+    for _ in range(REQUESTS_COUNT):
+        func()
+    return (time.perf_counter() - start) / REQUESTS_COUNT * 1_000_000
+
+
+def main():
+    """Run benchmark and print results"""
+    response = Response()
+    response.status_code = 200
+    response._content = b'{"id": 1}'
+    api = _NoIOApi(response)
+    request = Request(endpoint=Endpoints.Cluster, method=Methods.GET, object_id=1)
+    expected_response = ExpectedResponse(status_code=200)
+
+    legacy = _per_request_us(lambda: _legacy_url_and_step_name(api, request))
+    compiled = _per_request_us(
+        lambda: api.get_url_for_endpoint(request.endpoint, request.method, 1)
+    )
+    exec_request = _per_request_us(lambda: api.exec_request(request, expected_response))
+    api.close()
+
+    print(f"Formatted URL and step name: {legacy:8.2f} us/request")
+    print(f"Route table URL:             {compiled:8.2f} us/request")
+    print(f"Speedup:                     {legacy / compiled:8.2f}x")
+    print(f"exec_request without I/O:    {exec_request:8.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
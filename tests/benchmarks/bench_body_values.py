@@ -0,0 +1,54 @@
+"""
+Measure PreparedFieldValue.return_value hot path of request body preparation
+for 100k field values. If multipledispatch is installed, the same call through
+dispatch on arguments count (previous implementation) is measured for comparison
+"""
+import time
+
+from tests.utils import data_classes  # noqa: F401 resolves types import cycle
+from tests.utils.types import PreparedFieldValue, String
+
+VALUES_COUNT = 100_000
+
+
+def _prepare_values():
+    f_type = String()
+    return [
+        PreparedFieldValue(value="value", generated_value=index % 2 == 0, f_type=f_type)
+        for index in range(VALUES_COUNT)
+    ]
+
+
+def _measure(return_value, prepared_values) -> float:
+    start = time.perf_counter()
+    for prepared_value in prepared_values:
+        return_value(prepared_value, "pre-generated")
+    return time.perf_counter() - start
+
+
+def _dispatched_return_value():
+    try:
+        from multipledispatch import Dispatcher
+    except ImportError:
+        return None
+    dispatcher = Dispatcher("return_value")
+    dispatcher.add((object, object), PreparedFieldValue.return_value)
+    dispatcher.add(
+        (object, object, object, object), PreparedFieldValue.return_changed_value
+    )
+    return dispatcher
+
+
+def main():
+    """Run benchmark and print results"""
+    prepared_values = _prepare_values()
+    direct = _measure(PreparedFieldValue.return_value, prepared_values)
+    print(f"Direct return_value:     {direct * 1000:8.1f} ms")
+    if (dispatcher := _dispatched_return_value()) is not None:
+        dispatched = _measure(dispatcher, prepared_values)
+        print(f"multipledispatch:        {dispatched * 1000:8.1f} ms")
+        print(f"Speedup:                 {dispatched / direct:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
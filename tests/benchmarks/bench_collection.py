@@ -0,0 +1,58 @@
+"""
+Compare pytest collection time with datasets built from scratch (--regen-datasets)
+and with datasets loaded from on-disk cache
+"""
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from tests.test_data import generators  # noqa: F401 registers dataset builders
+from tests.test_data.datasets_cache import (
+    DATASETS_DIR,
+    build_datasets,
+    datasets_key,
+    load_datasets,
+)
+
+RUNS = 5
+TESTS_DIR = Path(__file__).parent.parent
+
+
+def _collect_time(*args) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", *args],
+        cwd=TESTS_DIR,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def _best_of(func, *args) -> float:
+    return min(func(*args) for _ in range(RUNS))
+
+
+def main():
+    """Run benchmark and print results"""
+    key = datasets_key()
+    build = _best_of(lambda: _timed(build_datasets, key))
+    _collect_time()  # make sure cache exists
+    load = _best_of(lambda: _timed(load_datasets, DATASETS_DIR / f"{key}.pickle"))
+    print(f"Datasets build:                  {build * 1000:8.1f} ms")
+    print(f"Datasets load from cache:        {load * 1000:8.1f} ms")
+    print(
+        f"Collection with --regen-datasets: {_best_of(_collect_time, '--regen-datasets'):8.3f} s"
+    )
+    print(f"Collection with cached datasets:  {_best_of(_collect_time):8.3f} s")
+
+
+def _timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Measure import time of data classes and time of special values materialization
+Special values are lazy, so import does not pay for them
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+RUNS = 10
+REPO_DIR = Path(__file__).parent.parent.parent
+
+_SCRIPT = """
+import time
+start = time.perf_counter()
+from tests.utils import data_classes
+from tests.utils.types import get_fields
+imported = time.perf_counter()
+for data_class in data_classes.BaseClass.__subclasses__():
+    for field in get_fields(data_class):
+        field.f_type.get_positive_values()
+        field.f_type.get_negative_values()
+print(imported - start, time.perf_counter() - imported)
+"""
+
+
+def _measure():
+    output = subprocess.run(
+        [sys.executable, "-c", _SCRIPT],
+        cwd=REPO_DIR,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return [float(value) for value in output.split()]
+
+
+def main():
+    """Run benchmark and print results"""
+    results = [_measure() for _ in range(RUNS)]
+    import_time = min(result[0] for result in results)
+    materialize_time = min(result[1] for result in results)
+    print(f"Import of data classes:          {import_time * 1000:8.2f} ms")
+    print(f"Special values materialization: {materialize_time * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Compare rows per second of DbFiller.create_bulk over HTTP
+and SqliteDbFiller.create_bulk writing APP DB file directly.
+Requires docker and APP image, each backend fills its own fresh container
+"""
+import sys
+import time
+
+from tests.test_data.db_filler import DbFiller
+from tests.test_data.getters import get_endpoint_data
+from tests.test_data.sqlite_filler import SqliteDbFiller
+from tests.utils.docker import DEFAULT_IMAGE, DEFAULT_TAG, DockerWrapper
+from tests.utils.endpoints import Endpoints
+from tests.utils.tools import split_tag
+
+HTTP_COUNT = 1_000
+SQLITE_COUNT = 100_000
+
+
+def _rows_per_second(image, make_filler, count) -> float:
+    repo, tag = image
+    app = DockerWrapper().run_app(image=repo, tag=tag)
+    try:
+        filler = make_filler(app)
+        start = time.perf_counter()
+        filler.create_bulk(endpoint=Endpoints.Backup, count=count)
+        duration = time.perf_counter() - start
+        rows = sum(len(get_endpoint_data(app.api, endpoint)) for endpoint in Endpoints)
+    finally:
+        app.api.close()
+        app.container.kill()
+    return rows / duration
+
+
+def main():
+    """Run benchmark and print results, APP image may be passed as first argument"""
+    repo, tag = split_tag(sys.argv[1]) if len(sys.argv) > 1 else (DEFAULT_IMAGE, None)
+    image = (repo, tag or DEFAULT_TAG)
+    http = _rows_per_second(image, lambda app: DbFiller(app=app.api), HTTP_COUNT)
+    sqlite = _rows_per_second(
+        image, lambda app: SqliteDbFiller(app=app.api, db=app), SQLITE_COUNT
+    )
+    print(f"HTTP POST ({HTTP_COUNT} backups):      {http:10.1f} rows/s")
+    print(f"SQLite file ({SQLITE_COUNT} backups): {sqlite:10.1f} rows/s")
+    print(f"Speedup:                         {sqlite / http:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Compare requests per second of per-call connections (module-level requests.request)
+and pooled keep-alive session of APPApi against local stub server
+"""
+import time
+
+import requests
+
+from tests.benchmarks.stub_server import stub_server
+from tests.utils.api_objects import APPApi, Request, ExpectedResponse
+from tests.utils.endpoints import Endpoints
+from tests.utils.methods import Methods
+
+REQUESTS_COUNT = 2000
+
+
+def _rps(func, count=REQUESTS_COUNT) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    """Run benchmark and print results"""
+    with stub_server() as url:
+        api = APPApi(url)
+        request = Request(endpoint=Endpoints.Cluster, method=Methods.LIST)
+        expected_response = ExpectedResponse(
+            status_code=Methods.LIST.default_success_code
+        )
+        list_url = api.get_url_for_endpoint(
+            endpoint=request.endpoint, method=request.method, object_id=None
+        )
+
+        before = _rps(lambda: requests.request("GET", list_url, json={}))
+        after = _rps(lambda: api.exec_request(request, expected_response))
+        api.close()
+
+    print(f"New connection per request: {before:10.1f} req/s")
+    print(f"APPApi pooled session:      {after:10.1f} req/s")
+    print(f"Speedup:                    {after / before:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Local stub of APP api for benchmarks"""
+import json
+import threading
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Answer any LIST/GET with empty list and any POST with created object"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _reply(self, status_code, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def do_GET(self):
+        """Handle GET"""
+        self._read_body()
+        self._reply(HTTPStatus.OK, [])
+
+    def do_POST(self):
+        """Handle POST"""
+        body = self._read_body()
+        self._reply(HTTPStatus.CREATED, {"id": 1, **json.loads(body or b"{}")})
+
+    def log_message(self, *args):
+        """Keep benchmark output clean"""
+
+
+@contextmanager
+def stub_server(ip="127.0.0.1"):
+    """Run stub server on a random free port and return its url"""
+    server = ThreadingHTTPServer((ip, 0), _StubHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield "http://{}:{}".format(*server.server_address)
+    finally:
+        server.shutdown()
+        server.server_close()
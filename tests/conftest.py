@@ -1,6 +1,8 @@
 """APP fixtures"""
 
+import random
 import time
+from typing import Dict, Iterator, Optional, Tuple
 
 import allure
 import docker
@@ -15,9 +17,24 @@ from .utils.docker import (
     DockerWrapper,
     get_initialized_app_image,
     gather_app_data_from_container,
+    leftover_containers,
 )
-from .utils.api_objects import APPApi
+from .utils.api_objects import APPApi, BudgetPolicy
+from .test_data import datasets_cache
+from .test_data.sqlite_filler import SqliteDbFiller
+from .test_data.seeded_images import (
+    DEFAULT_DATASET_SPEC,
+    DatasetSpec,
+    get_seeded_app_image,
+)
+from .utils.container_pool import ContainerPool
+from .utils.request_log import DEFAULT_BUFFER_SIZE, RequestLog, RequestLogPolicy
+from .utils.request_metrics import RequestMetrics
 from .utils.tools import split_tag
+from .utils.values import values
+
+CONTAINER_POOL_STATS = pytest.StashKey[dict]()
+REQUEST_METRICS = pytest.StashKey[RequestMetrics]()
 
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
@@ -51,6 +68,141 @@ def pytest_addoption(parser):
         help="Ex: app:latest",
     )
 
+    parser.addoption(
+        "--container-pool-size",
+        action="store",
+        type=int,
+        default=1,
+        help="Count of warmed APP containers reused across tests of each worker. "
+        "Use 0 to run fresh container for every test",
+    )
+
+    parser.addoption(
+        "--request-log",
+        action="store",
+        choices=[policy.value for policy in RequestLogPolicy],
+        default=RequestLogPolicy.ON_FAILURE.value,
+        help="When to attach APP request logs to Allure report",
+    )
+
+    parser.addoption(
+        "--request-log-buffer",
+        action="store",
+        type=int,
+        default=DEFAULT_BUFFER_SIZE,
+        help="Count of last requests attached to failed test with on-failure request log",
+    )
+
+    parser.addoption(
+        "--budgets",
+        action="store",
+        choices=[policy.value for policy in BudgetPolicy],
+        default=BudgetPolicy.SOFT.value,
+        help="How APP response latency and body size budgets are enforced: "
+        "fail the test, fail only the step or do not check",
+    )
+
+    parser.addoption(
+        "--request-metrics",
+        action="store",
+        default=None,
+        help="Path of JSON file to write APP requests latency and size percentiles to",
+    )
+
+    parser.addoption(
+        "--regen-datasets",
+        action="store_true",
+        default=False,
+        help="Rebuild cached test datasets even if schema sources are not changed",
+    )
+
+    parser.addoption(
+        "--random-seed",
+        action="store",
+        type=int,
+        default=None,
+        help="Seed of generated values, each xdist worker derives its own seed from it. "
+        "Random by default, actual seed is shown in report header",
+    )
+
+
+def pytest_configure(config):
+    """Apply options needed before test modules import"""
+    datasets_cache.regen_datasets = config.option.regen_datasets
+
+    if hasattr(config, "workerinput"):
+        # xdist worker gets seed from controller
+        seed = config.workerinput["random_seed"]
+        values.reseed(f"{seed}-{config.workerinput['workerid']}")
+    else:
+        seed = config.option.random_seed
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        values.reseed(seed)
+    config.option.random_seed = seed
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Pass random seed to xdist worker"""
+    node.workerinput["random_seed"] = node.config.option.random_seed
+
+
+def pytest_report_header(config):
+    """Show random seed to reproduce generated values"""
+    return f"random seed: {config.option.random_seed}"
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Collect container pool stats and requests metrics from xdist worker"""
+    for pool_name, stats in node.workeroutput.get("container_pool_stats", {}).items():
+        node.config.stash.setdefault(CONTAINER_POOL_STATS, {})[
+            f"{node.workerinput['workerid']} {pool_name}"
+        ] = stats
+    if state := node.workeroutput.get("request_metrics"):
+        _stash_request_metrics(node.config, RequestMetrics.from_dict(state))
+
+
+def _report_container_pool_stats(config, pool_name: str, pool: ContainerPool):
+    """Pass pool stats from xdist worker or stash them for terminal summary"""
+    stats = pool.stats_summary()
+    if hasattr(config, "workeroutput"):
+        config.workeroutput.setdefault("container_pool_stats", {})[pool_name] = stats
+    else:
+        config.stash.setdefault(CONTAINER_POOL_STATS, {})[f"main {pool_name}"] = stats
+
+
+def _stash_request_metrics(config, metrics: RequestMetrics):
+    if (session_metrics := config.stash.get(REQUEST_METRICS, None)) is None:
+        config.stash[REQUEST_METRICS] = metrics
+    else:
+        session_metrics.merge(metrics)
+
+
+def pytest_sessionfinish(session):
+    """Write requests metrics of all workers to JSON file"""
+    if (
+        hasattr(session.config, "workeroutput")
+        or not session.config.option.request_metrics
+    ):
+        return
+    if (metrics := session.config.stash.get(REQUEST_METRICS, None)) is not None:
+        metrics.write_summary(session.config.option.request_metrics)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Show container pool timings"""
+    if not (workers_stats := config.stash.get(CONTAINER_POOL_STATS, None)):
+        return
+    terminalreporter.write_sep("-", "APP container pool timings, seconds")
+    for worker, stats in sorted(workers_stats.items()):
+        for name, counter in stats.items():
+            terminalreporter.write_line(
+                f"{worker} {name}: "
+                + ", ".join(f"{key}={value}" for key, value in counter.items())
+            )
+
 
 @pytest.fixture(scope="session")
 def cmd_opts(request):
@@ -61,10 +213,12 @@ def cmd_opts(request):
 def _image(request, cmd_opts):
     """This fixture creates APP container, waits until
     database becomes initialised and store that as images
-    with random tag and name local/app
+    with name local/app and tag derived from APP sources
 
-    That can be useful to use that fixture to make APP
-    container startup time shorter.
+    Image is kept after session and reused by next sessions
+    and xdist workers while APP is not changed, old images
+    are removed by least recently used (see image_cache module).
+    Containers started by the session should be gone at its end.
 
     Fixture returns list:
     repo, tag
@@ -81,16 +235,7 @@ def _image(request, cmd_opts):
     if not cmd_opts.dontstop:
 
         def fin():
-            image_name = "{}:{}".format(*init_image.values())
-            for container in dc.containers.list(filters=dict(ancestor=image_name)):
-                try:
-                    container.wait(condition="removed", timeout=30)
-                except ConnectionError:
-                    # https://github.com/docker/docker-py/issues/1966 workaround
-                    pass
-            dc.images.remove(image_name, force=True)
-            containers = dc.containers.list(filters=dict(ancestor=image_name))
-            if len(containers) > 0:
+            if containers := leftover_containers(dc=dc):
                 raise RuntimeWarning(f"There are containers left! {containers}")
 
         request.addfinalizer(fin)
@@ -98,34 +243,56 @@ def _image(request, cmd_opts):
     return init_image["repo"], init_image["tag"]
 
 
-def _app(image, request) -> APP:
-    repo, tag = image
-    dw = DockerWrapper()
-    app = dw.run_app(image=repo, tag=tag)
+def _app(
+    image, request, pool: ContainerPool = None, metrics: RequestMetrics = None
+) -> APP:
+    if pool is not None:
+        app = pool.checkout()
+    else:
+        repo, tag = image
+        dw = DockerWrapper()
+        app = dw.run_app(image=repo, tag=tag)
+    app.api.request_log = RequestLog(
+        policy=RequestLogPolicy(request.config.option.request_log),
+        buffer_size=request.config.option.request_log_buffer,
+    )
+    app.api.budget_policy = BudgetPolicy(request.config.option.budgets)
+    # pooled container keeps its hooks between tests
+    if metrics is not None and metrics not in app.api.hooks:
+        app.api.hooks.append(metrics)
 
     def fin():
+        gather = True
+        try:
+            if not request.node.rep_call.failed:
+                gather = False
+        except AttributeError:
+            # There is no rep_call attribute. Presumably test setup failed,
+            # or fixture scope is not function. Will collect /adcm/data anyway
+            pass
+        if gather:
+            app.api.request_log.attach_buffered()
         if not request.config.option.dontstop:
-            gather = True
-            try:
-                if not request.node.rep_call.failed:
-                    gather = False
-            except AttributeError:
-                # There is no rep_call attribute. Presumably test setup failed,
-                # or fixture scope is not function. Will collect /adcm/data anyway
-                pass
             if gather:
                 with allure.step(
                     f"Gather /var/www/html/storage/app/ from APP container: {app.container.id}"
                 ):
                     file_name = f"{request.node.name}_{time.time()}"
                     try:
-                        with gather_app_data_from_container(app) as data:
-                            allure.attach(
-                                data, name="{}.tgz".format(file_name), extension="tgz"
+                        with gather_app_data_from_container(app) as archive_path:
+                            allure.attach.file(
+                                archive_path,
+                                name="{}.tgz".format(file_name),
+                                extension="tgz",
                             )
                     except NotFound:
                         pass
 
+            if pool is not None:
+                pool.give_back(app)
+                return
+
+            app.api.close()
             try:
                 retry_call(
                     app.container.kill,
@@ -149,9 +316,104 @@ def image(request, cmd_opts):
     return _image(request, cmd_opts)
 
 
+@pytest.fixture(scope="session")
+def container_pool(image, request, cmd_opts) -> Iterator[Optional[ContainerPool]]:
+    """
+    Pool of warmed APP containers (session scope, so each xdist worker has its own)
+    Returns None if pool is disabled with --container-pool-size=0
+    """
+    if not cmd_opts.container_pool_size:
+        yield None
+        return
+    pool = ContainerPool(image=image, size=cmd_opts.container_pool_size)
+    try:
+        pool.warm_up()
+        yield pool
+    finally:
+        pool.close()
+        _report_container_pool_stats(request.config, "pool", pool)
+
+
+@pytest.fixture(scope="session")
+def request_metrics(request) -> Iterator[RequestMetrics]:
+    """
+    Latency and size metrics of all APP requests (session scope, so per xdist worker)
+    Summary is attached to Allure report, metrics of all workers are written to
+    --request-metrics JSON file at the end of session
+    """
+    metrics = RequestMetrics()
+    yield metrics
+    metrics.attach_summary()
+    if hasattr(request.config, "workeroutput"):
+        request.config.workeroutput["request_metrics"] = metrics.to_dict()
+    else:
+        _stash_request_metrics(request.config, metrics)
+
+
+@pytest.fixture()
+def app_container(image, container_pool, request_metrics, request) -> APP:
+    """Runs APP container with a previously initialized image
+    or takes reset one from container pool.
+    Returns APP object with api and container of APP
+    """
+    return _app(image, request, pool=container_pool, metrics=request_metrics)
+
+
+@pytest.fixture()
+def app_fs(app_container) -> APPApi:
+    """Returns authorized instance of APPApi object of app_container"""
+    return app_container.api
+
+
+@pytest.fixture()
+def db_filler(app_container) -> SqliteDbFiller:
+    """
+    DbFiller of app_fs that creates objects in bulk by writing APP DB file directly
+    (see sqlite_filler module)
+    """
+    return SqliteDbFiller(app=app_container.api, db=app_container)
+
+
+@pytest.fixture(scope="session")
+def seeded_container_pools(
+    image, request
+) -> Iterator[Dict[Tuple[str, str], ContainerPool]]:
+    """
+    Pools of warmed APP containers of seeded images by image (session scope)
+    Pools depend on image fixture, so they are closed before check of leftover containers
+    """
+    pools = {}
+    try:
+        yield pools
+    finally:
+        for (repo, tag), pool in pools.items():
+            pool.close()
+            _report_container_pool_stats(request.config, f"{repo}:{tag} pool", pool)
+
+
+@pytest.fixture(scope="session")
+def seeded_images() -> Dict[Tuple[Tuple[str, str], DatasetSpec], Tuple[str, str]]:
+    """Seeded images by base image and dataset spec, each is resolved once (session scope)"""
+    return {}
+
+
 @pytest.fixture()
-def app_fs(image, request) -> APPApi:
-    """Runs APP container with a previously initialized image.
+def seeded_app_fs(
+    image, seeded_images, seeded_container_pools, request_metrics, request, cmd_opts
+) -> APPApi:
+    """Runs APP container with pre-seeded dataset (see seeded_images module)
+    Dataset is selected by indirect parametrization with DatasetSpec,
+    DEFAULT_DATASET_SPEC is used if fixture is not parametrized.
     Returns authorized instance of APPApi object
     """
-    return _app(image, request).api
+    spec = getattr(request, "param", DEFAULT_DATASET_SPEC)
+    if (seeded_image := seeded_images.get((image, spec))) is None:
+        seeded_image = get_seeded_app_image(image, spec)
+        seeded_images[(image, spec)] = seeded_image
+    pool = None
+    if cmd_opts.container_pool_size:
+        if (pool := seeded_container_pools.get(seeded_image)) is None:
+            pool = ContainerPool(image=seeded_image, size=cmd_opts.container_pool_size)
+            seeded_container_pools[seeded_image] = pool
+            pool.warm_up()
+    return _app(seeded_image, request, pool=pool, metrics=request_metrics).api
@@ -1,15 +1,21 @@
 """Some asserts with allure steps"""
-import json
 from http import HTTPStatus
 
 import allure
 from requests import Response
 
+from ..utils.json_codec import pretty
+from ..utils.json_diff import json_diff
+
 
 class BodyAssertionError(AssertionError):
     """Raised when body is not as expected"""
 
 
+class BudgetExceededError(AssertionError):
+    """Raised when response latency or body size is above its budget"""
+
+
 @allure.step("Response status code should be equal {status_code}")
 def status_code_should_be(response: Response, status_code=HTTPStatus.OK):
     """Assert response status code"""
@@ -19,20 +25,55 @@ def status_code_should_be(response: Response, status_code=HTTPStatus.OK):
 
 
 @allure.step("Response body should be")
-def body_should_be(response: Response, expected_body=None):
-    """Assert response body and attach it"""
+def body_should_be(
+    response: Response, expected_body=None, ignore_fields=(), partial=False, fast=False
+):
+    """
+    Assert response body and attach both bodies with differences if they differ
+    See json_diff for ignore_fields, partial and fast arguments
+    """
     actual_body = response.json()
+    differences = json_diff(
+        actual_body,
+        expected_body,
+        ignore_fields=ignore_fields,
+        partial=partial,
+        fast=fast,
+    )
+    if not differences:
+        return
     allure.attach(
-        json.dumps(expected_body, indent=2),
+        "\n".join(differences),
+        name="Body differences",
+        attachment_type=allure.attachment_type.TEXT,
+    )
+    allure.attach(
+        pretty(expected_body),
         name="Expected body",
         attachment_type=allure.attachment_type.JSON,
     )
     allure.attach(
-        json.dumps(actual_body, indent=2),
+        pretty(actual_body),
         name="Actual body",
         attachment_type=allure.attachment_type.JSON,
     )
-    try:
-        assert actual_body == expected_body, "Response body assertion failed!"
-    except AssertionError as error:
-        raise BodyAssertionError(error) from error
+    raise BodyAssertionError(
+        "Response body assertion failed!\n" + "\n".join(differences[:10])
+    )
+
+
+@allure.step("Response should fit budget")
+def response_should_fit_budget(
+    response: Response, max_latency_ms=None, max_body_bytes=None
+):
+    """Assert response latency and body size, None budget is not checked"""
+    latency_ms = response.elapsed.total_seconds() * 1000
+    if max_latency_ms is not None and latency_ms > max_latency_ms:
+        raise BudgetExceededError(
+            f"Response latency {latency_ms:.1f} ms exceeds budget {max_latency_ms} ms"
+        )
+    body_bytes = len(response.content)
+    if max_body_bytes is not None and body_bytes > max_body_bytes:
+        raise BudgetExceededError(
+            f"Response body size {body_bytes} bytes exceeds budget {max_body_bytes} bytes"
+        )
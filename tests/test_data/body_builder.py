@@ -0,0 +1,43 @@
+"""Request body assembly for body tests"""
+from functools import lru_cache
+from typing import Dict
+
+from tests.utils.endpoints import Endpoints
+from tests.utils.types import PreparedFieldValue, get_fields
+
+
+class BodyBuilder:
+    """
+    Builds request bodies of endpoint from valid body and prepared field values
+    Field layout of endpoint is compiled once, see get_body_builder()
+    """
+
+    __slots__ = ("_field_names",)
+
+    def __init__(self, endpoint: Endpoints):
+        self._field_names = tuple(
+            field.name for field in get_fields(endpoint.data_class)
+        )
+
+    def build(
+        self, valid_body: dict, prepared_values: Dict[str, PreparedFieldValue]
+    ) -> dict:
+        """
+        Return new body: shallow copy of valid body overlaid with prepared values
+        Valid body values are expected to be scalars, so they are safe to share
+        """
+        body = dict(valid_body)
+        for name in self._field_names:
+            if (prepared_value := prepared_values.get(name)) is None:
+                continue
+            if prepared_value.drop_key:
+                body.pop(name, None)
+            else:
+                body[name] = prepared_value.return_value(body.get(name))
+        return body
+
+
+@lru_cache(maxsize=None)
+def get_body_builder(endpoint: Endpoints) -> BodyBuilder:
+    """Return body builder of endpoint"""
+    return BodyBuilder(endpoint)
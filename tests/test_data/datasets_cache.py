@@ -0,0 +1,121 @@
+"""
+On-disk cache of generated test datasets
+Datasets are built once for a given version of their sources and pickled,
+so repeated collections and each xdist worker only load them.
+Sources are modules of builders and all modules of tests package they use,
+directly or through other modules, including modules of pickled classes.
+"""
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from functools import wraps
+from pathlib import Path
+from types import ModuleType
+
+from tests.utils.values import values
+
+DATASETS_DIR = Path(__file__).parent.parent / ".datasets"
+
+# Set by --regen-datasets option
+regen_datasets = False
+
+_builders = {}
+_datasets = None
+
+
+def _module_dependencies(module: ModuleType) -> set:
+    """Names of modules whose objects are used by module"""
+    names = set()
+    for value in vars(module).values():
+        if isinstance(value, ModuleType):
+            names.add(value.__name__)
+        elif isinstance(name := getattr(value, "__module__", None), str):
+            names.add(name)
+    return names
+
+
+def dataset_sources(*modules: str) -> list:
+    """
+    Files of modules of tests package that given modules depend on, including them
+    Modules of registered builders are used if no modules are given
+    """
+    seen = set()
+    pending = set(modules) or {func.__module__ for func in _builders.values()}
+    while pending:
+        name = pending.pop()
+        if name in seen or name.split(".")[0] != "tests" or name not in sys.modules:
+            continue
+        seen.add(name)
+        pending |= _module_dependencies(sys.modules[name])
+    files = (getattr(sys.modules[name], "__file__", None) for name in seen)
+    return sorted(Path(file) for file in files if file)
+
+
+def datasets_key() -> str:
+    """Hash of dataset sources, cached datasets are valid only for the same key"""
+    sha = hashlib.sha256(sys.version.encode("utf-8"))
+    for source in dataset_sources():
+        sha.update(source.name.encode("utf-8"))
+        sha.update(source.read_bytes())
+    return sha.hexdigest()[:16]
+
+
+def cached_dataset(func):
+    """Decorator for dataset builders, decorated builder returns cached dataset"""
+    _builders[func.__name__] = func
+
+    @wraps(func)
+    def wrapper():
+        return _get_datasets()[func.__name__]
+
+    return wrapper
+
+
+def build_datasets(key: str) -> dict:
+    """Build all datasets with values factory seeded by key, so build is reproducible"""
+    with values.seeded(key):
+        return {name: builder() for name, builder in _builders.items()}
+
+
+def _get_datasets() -> dict:
+    global _datasets
+    if _datasets is None:
+        key = datasets_key()
+        path = DATASETS_DIR / f"{key}.pickle"
+        if not regen_datasets:
+            _datasets = load_datasets(path)
+        if _datasets is None or _datasets.keys() != _builders.keys():
+            _datasets = build_datasets(key)
+            save_datasets(path, _datasets)
+            prune_datasets(keep=path)
+    return _datasets
+
+
+def load_datasets(path: Path):
+    """Load pickled datasets, return None if there is no valid file"""
+    try:
+        with path.open("rb") as file:
+            return pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+
+
+def save_datasets(path: Path, datasets: dict):
+    """Write atomically, concurrent writers of the same key produce the same file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as file:
+        pickle.dump(datasets, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(file.name, path)
+
+
+def prune_datasets(keep: Path):
+    """Remove datasets of other keys, they are stale once sources changed"""
+    for path in keep.parent.glob("*.pickle"):
+        if path != keep:
+            try:
+                path.unlink()
+            except OSError:
+                # already removed by another xdist worker
+                pass
@@ -1,38 +1,210 @@
 """Fill DB methods"""
 
-import random
 from collections import defaultdict
+from typing import List, Optional, Tuple
 
 import allure
+from requests import Response
 
 from tests.test_data.getters import get_endpoint_data, get_object_data
-from tests.utils.api_objects import Request, ExpectedResponse, APPApi
+from tests.test_data.planner import plan_creation
+from tests.utils.api_objects import (
+    Request,
+    ExpectedResponse,
+    APPApi,
+    APIHook,
+    AsyncAPPApi,
+    DEFAULT_POOL_SIZE,
+)
 from tests.utils.endpoints import Endpoints
 from tests.utils.methods import Methods
+from tests.utils.traffic import SETUP_TRAFFIC, tagged_traffic
+from tests.utils.values import values
 from tests.utils.types import (
-    get_fields,
     Field,
-    is_fk_field,
     ForeignKey,
     get_field_name_by_fk_dataclass,
 )
 
 
+def _generate_unique_values(
+    field: Field, count: int, used_values: set, tries=100
+) -> list:
+    """Generate batch of field values that are not in used_values"""
+    result = []
+    for value in field.f_type.generate_many(count):
+        for _ in range(tries):
+            if value not in used_values:
+                break
+            value = field.f_type.generate()
+        else:
+            raise ValueError(f"Unable to generate unique value for {field.name}")
+        used_values.add(value)
+        result.append(value)
+    return result
+
+
+def _fk_id(value):
+    """FK value may be an id or a nested object"""
+    if isinstance(value, dict):
+        return value.get("id")
+    return value
+
+
+class ObjectsCache(APIHook):
+    """
+    Write-through cache of APP objects, one per APPApi (see get_objects_cache)
+    Filled by responses of APPApi it is hooked to: created (POST), fetched (GET)
+    and listed (LIST) objects. Endpoint data becomes complete after its first LIST,
+    since all objects created later pass through the same APPApi.
+    LIST rows lack links to related objects and huge fields, so only objects
+    created or fetched with GET are full and returned by get_object().
+    Cache is invalidated on APP DB reset.
+    """
+
+    __slots__ = ("_objects", "_full", "_complete", "_fk_index", "hits", "misses")
+
+    def __init__(self):
+        self._objects = defaultdict(dict)
+        self._full = defaultdict(set)
+        self._complete = set()
+        self._fk_index = defaultdict(set)
+        self.hits = 0
+        self.misses = 0
+
+    def after_response(self, request: Request, response: Response):
+        if response.status_code != request.method.default_success_code:
+            return
+        if request.method == Methods.LIST:
+            known = self._objects.get(request.endpoint, {})
+            full = self._full.get(request.endpoint, set())
+            self._forget_endpoint(request.endpoint)
+            for obj in response.json():
+                if obj["id"] in full:
+                    self.add(request.endpoint, {**known[obj["id"]], **obj})
+                else:
+                    self.add(request.endpoint, obj, full=False)
+            self._complete.add(request.endpoint)
+        else:
+            self.add(request.endpoint, response.json())
+
+    def after_db_reset(self):
+        self.clear()
+
+    def clear(self):
+        """Forget all cached objects"""
+        self._objects.clear()
+        self._full.clear()
+        self._complete.clear()
+        self._fk_index.clear()
+
+    def add(self, endpoint: Endpoints, obj: dict, full=True):
+        """Add or update object data, full is False for partial data, e.g. LIST rows"""
+        self._objects[endpoint].setdefault(obj["id"], {}).update(obj)
+        if full:
+            self._full[endpoint].add(obj["id"])
+        for field in endpoint.data_class.schema.fk_fields:
+            if (value := _fk_id(obj.get(field.name))) is not None:
+                self._fk_index[(endpoint, field.name, value)].add(obj["id"])
+
+    def get_endpoint_data(self, endpoint: Endpoints) -> Optional[list]:
+        """Return all endpoint objects or None if they are not known yet"""
+        if endpoint in self._complete:
+            self.hits += 1
+            return list(self._objects[endpoint].values())
+        self.misses += 1
+        return None
+
+    def get_object(
+        self, endpoint: Endpoints, object_id: int, required_fields=None
+    ) -> Optional[dict]:
+        """
+        Return full object data or None if it is not known yet
+        With required_fields any known data that has all of them is returned
+        """
+        obj = self._objects[endpoint].get(object_id)
+        if required_fields is None:
+            known = object_id in self._full[endpoint]
+        else:
+            known = obj is not None and all(field in obj for field in required_fields)
+        if known:
+            self.hits += 1
+            return obj
+        self.misses += 1
+        return None
+
+    def find(self, endpoint: Endpoints, **fk_values) -> list:
+        """Return known endpoint objects with given FK field values"""
+        ids = set(self._objects[endpoint])
+        for field_name, value in fk_values.items():
+            ids &= self._fk_index[(endpoint, field_name, value)]
+        return [self._objects[endpoint][object_id] for object_id in ids]
+
+    def stats(self) -> dict:
+        """Return cache hits and misses"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+    def _forget_endpoint(self, endpoint: Endpoints):
+        self._objects.pop(endpoint, None)
+        self._full.pop(endpoint, None)
+        self._complete.discard(endpoint)
+        for key in [key for key in self._fk_index if key[0] == endpoint]:
+            del self._fk_index[key]
+
+
+def get_objects_cache(app: APPApi) -> ObjectsCache:
+    """Return objects cache hooked to APPApi, create it if there is none"""
+    for hook in app.hooks:
+        if isinstance(hook, ObjectsCache):
+            return hook
+    cache = ObjectsCache()
+    app.hooks.append(cache)
+    return cache
+
+
 class DbFiller:
     """Utils to prepare data in DB before test"""
 
-    __slots__ = ("app", "_available_fkeys", "_used_fkeys")
+    __slots__ = ("app", "cache", "_available_fkeys", "_used_fkeys")
 
     def __init__(self, app: APPApi):
         self.app = app
+        self.cache = get_objects_cache(app)
         self._available_fkeys = defaultdict(set)
         self._used_fkeys = {}
 
+    def _get_endpoint_data(self, endpoint: Endpoints) -> list:
+        """Get endpoint data from cache, fetch it with LIST on cache miss"""
+        if (data := self.cache.get_endpoint_data(endpoint)) is not None:
+            return data
+        return get_endpoint_data(app=self.app, endpoint=endpoint)
+
+    def _get_object_data(self, endpoint: Endpoints, object_id: int) -> dict:
+        """Get object data from cache, fetch it with GET on cache miss"""
+        if (data := self.cache.get_object(endpoint, object_id)) is not None:
+            return data
+        return get_object_data(app=self.app, endpoint=endpoint, object_id=object_id)
+
     @allure.step("Generate valid request data")
     def generate_valid_request_data(self, endpoint: Endpoints, method: Methods) -> dict:
         """
         Return valid request body and url params for endpoint and method combination
         """
+        with tagged_traffic(SETUP_TRAFFIC):
+            request_data = self._generate_valid_request_data(endpoint, method)
+        allure.attach(
+            str(self.cache.stats()),
+            name="Objects cache stats",
+            attachment_type=allure.attachment_type.TEXT,
+        )
+        return request_data
+
+    def _generate_valid_request_data(self, endpoint: Endpoints, method: Methods):
         # POST
         if method == Methods.POST:
             return {
@@ -48,8 +220,7 @@ class DbFiller:
             self._get_or_create_multiple_data_for_endpoint(endpoint=endpoint, count=3)
             return {"data": None, "url_params": {}}
 
-        full_item = get_object_data(
-            app=self.app,
+        full_item = self._get_object_data(
             endpoint=endpoint,
             object_id=self._get_or_create_data_for_endpoint(endpoint=endpoint)[0]["id"],
         )
@@ -65,7 +236,7 @@ class DbFiller:
         Get data for endpoint with data preparation
         """
         if force and not prepare_data_only and Methods.POST not in endpoint.methods:
-            if current_ep_data := get_endpoint_data(app=self.app, endpoint=endpoint):
+            if current_ep_data := self._get_endpoint_data(endpoint):
                 return current_ep_data
             raise ValueError(
                 f"Force data creation is not available for {endpoint.path}"
@@ -74,7 +245,7 @@ class DbFiller:
 
         if not force:
             # try to fetch data from current endpoint
-            if current_ep_data := get_endpoint_data(app=self.app, endpoint=endpoint):
+            if current_ep_data := self._get_endpoint_data(endpoint):
                 return current_ep_data
 
         data = self._prepare_data_for_object_creation(endpoint=endpoint, force=force)
@@ -96,13 +267,9 @@ class DbFiller:
 
     def _prepare_data_for_object_creation(self, endpoint: Endpoints, force=False):
         data = {}
-        for field in get_fields(
-            data_class=endpoint.data_class,
-            predicate=lambda x: x.name != "id" and is_fk_field(x),
-        ):
-            fk_data = get_endpoint_data(
-                app=self.app,
-                endpoint=Endpoints.get_by_data_class(field.f_type.fk_link),
+        for field in endpoint.data_class.schema.fk_fields:
+            fk_data = self._get_endpoint_data(
+                Endpoints.get_by_data_class(field.f_type.fk_link)
             )
             if not fk_data or force:
                 fk_data = self._get_or_create_data_for_endpoint(
@@ -110,10 +277,7 @@ class DbFiller:
                     force=force,
                 )
             data[field.name] = self._choose_fk_field_value(field=field, fk_data=fk_data)
-        for field in get_fields(
-            data_class=endpoint.data_class,
-            predicate=lambda x: x.name != "id" and not is_fk_field(x),
-        ):
+        for field in endpoint.data_class.schema.plain_fields:
             data[field.name] = field.f_type.generate()
 
         return data
@@ -123,25 +287,117 @@ class DbFiller:
     ):
         """
         Method for multiple data creation for given endpoint.
-        For each object new object chain will be created.
         If endpoint does not allow data creation of any kind (POST, indirect creation, etc.)
         method will proceed without data creation or errors
-        IMPORTANT: Class context _available_fkeys and _used_fkeys
-                   will be relevant only for the last object in set
         """
-        current_ep_data = get_endpoint_data(app=self.app, endpoint=endpoint)
-        if len(current_ep_data) < count:
-            for _ in range(count - len(current_ep_data)):
-                # clean up context before generating new element
-                self._available_fkeys = defaultdict(set)
-                self._used_fkeys = {}
-                self._get_or_create_data_for_endpoint(
-                    endpoint=endpoint,
-                    force=True,
-                    prepare_data_only=False,
+        self.create_bulk(endpoint=endpoint, count=count)
+
+    @allure.step("Create at least {count} objects for {endpoint}")
+    def create_bulk(
+        self, endpoint: Endpoints, count: int, max_in_flight=DEFAULT_POOL_SIZE
+    ) -> list:
+        """
+        Create objects so that endpoint has at least "count" of them and return endpoint data
+        Creation is planned by data classes dependencies (see planner module),
+        existing objects are reused as dependencies. Each layer of the plan is created
+        with concurrent POST requests. Requests are tagged as setup traffic in metrics.
+        """
+        with tagged_traffic(SETUP_TRAFFIC):
+            for layer in plan_creation(endpoint=endpoint, count=count):
+                layer_data = []
+                for layer_endpoint, required_count in layer:
+                    if Methods.POST not in layer_endpoint.methods:
+                        continue
+                    existing = self._get_endpoint_data(layer_endpoint)
+                    data_list = self._prepare_bulk_data(
+                        endpoint=layer_endpoint,
+                        count=required_count - len(existing),
+                        existing=existing,
+                    )
+                    if data_list:
+                        layer_data.append((layer_endpoint, data_list))
+                if layer_data:
+                    self._create_objects(layer_data, max_in_flight=max_in_flight)
+            return self._get_endpoint_data(endpoint)
+
+    def _create_objects(
+        self, layer_data: List[Tuple[Endpoints, List[dict]]], max_in_flight: int
+    ):
+        """Create objects of independent endpoints with concurrent POST requests"""
+        with AsyncAPPApi(self.app, max_in_flight=max_in_flight) as async_api:
+            async_api.exec_requests(
+                [
+                    (
+                        Request(
+                            endpoint=layer_endpoint, method=Methods.POST, data=data
+                        ),
+                        ExpectedResponse(
+                            status_code=Methods.POST.value.default_success_code
+                        ),
+                    )
+                    for layer_endpoint, data_list in layer_data
+                    for data in data_list
+                ]
+            )
+
+    def _prepare_bulk_data(self, endpoint: Endpoints, count: int, existing: list):
+        """
+        Prepare request bodies for objects creation, dependencies should already exist
+        FK values are distributed round-robin over existing FK objects. FK values shared
+        with implicit dependency are taken from one of its objects to keep them consistent.
+        """
+        if count <= 0:
+            return []
+        fk_fields = endpoint.data_class.schema.fk_fields
+        fk_ids = {}
+        for field in fk_fields:
+            fk_ids[field.name] = [
+                obj["id"]
+                for obj in self._get_endpoint_data(
+                    Endpoints.get_by_data_class(field.f_type.fk_link)
+                )
+            ]
+            if not fk_ids[field.name]:
+                raise ValueError(
+                    f"There is no data for {field.name} of {endpoint.path}"
                 )
-                if len(get_endpoint_data(app=self.app, endpoint=endpoint)) > count:
-                    break
+        implicit_dependencies = []
+        for data_class in endpoint.data_class.implicitly_depends_on:
+            shared_fields = {}
+            for field in fk_fields:
+                try:
+                    shared_fields[field.name] = get_field_name_by_fk_dataclass(
+                        data_class=data_class, fk_data_class=field.f_type.fk_link
+                    )
+                except AttributeError:
+                    continue
+            implicit_dependencies.append(
+                (
+                    shared_fields,
+                    self._get_endpoint_data(Endpoints.get_by_data_class(data_class)),
+                )
+            )
+        other_fields = endpoint.data_class.schema.plain_fields
+        generated_values = {
+            field.name: _generate_unique_values(
+                field=field,
+                count=count,
+                used_values={obj.get(field.name) for obj in existing},
+            )
+            for field in other_fields
+        }
+
+        data_list = []
+        for index in range(count):
+            data = {name: ids[index % len(ids)] for name, ids in fk_ids.items()}
+            for shared_fields, objects in implicit_dependencies:
+                obj = objects[index % len(objects)]
+                for field_name, dependency_field_name in shared_fields.items():
+                    data[field_name] = _fk_id(obj[dependency_field_name])
+            for field_name, field_values in generated_values.items():
+                data[field_name] = field_values[index]
+            data_list.append(data)
+        return data_list
 
     def _choose_fk_field_value(self, field: Field, fk_data: list):
         """Choose a random fk value for the specified field"""
@@ -154,7 +410,7 @@ class DbFiller:
                 new_fk = True
                 fk_vals = {el["id"] for el in fk_data}
 
-            key = random.choice(list(fk_vals))
+            key = values.choice(list(fk_vals))
             result = key
             self._used_fkeys[fk_class_name] = key
             self._available_fkeys[fk_class_name].add(key)
@@ -168,18 +424,52 @@ class DbFiller:
 
     def _add_child_fk_values_to_available_fkeys(self, fk_ids: list, fk_data_class):
         """Add information about child FK values to metadata for further consistency"""
-        for child_fk_field in get_fields(
-            data_class=fk_data_class, predicate=is_fk_field
-        ):
-            fk_field_name = get_field_name_by_fk_dataclass(
+        child_fk_fields = fk_data_class.schema.fk_fields
+        if not child_fk_fields:
+            return
+        fk_field_names = [
+            get_field_name_by_fk_dataclass(
                 data_class=fk_data_class, fk_data_class=child_fk_field.f_type.fk_link
             )
-            for fk_id in fk_ids:
-                fk_data = get_object_data(
-                    app=self.app,
-                    endpoint=Endpoints.get_by_data_class(fk_data_class),
-                    object_id=fk_id,
-                )
+            for child_fk_field in child_fk_fields
+        ]
+        fk_objects = self._get_objects_data(
+            endpoint=Endpoints.get_by_data_class(fk_data_class),
+            object_ids=fk_ids,
+            required_fields=fk_field_names,
+        )
+        for child_fk_field, fk_field_name in zip(child_fk_fields, fk_field_names):
+            for fk_data in fk_objects:
                 self._available_fkeys[child_fk_field.f_type.fk_link.__name__].add(
-                    fk_data[fk_field_name]["id"]
+                    _fk_id(fk_data[fk_field_name])
+                )
+
+    def _get_objects_data(
+        self, endpoint: Endpoints, object_ids: list, required_fields: list
+    ) -> list:
+        """
+        Get data of several objects in bulk
+        Objects with required fields are taken from cache, the rest is fetched
+        with one LIST. GET is used only for objects that LIST does not return
+        with required fields
+        """
+        objects = {
+            object_id: self.cache.get_object(endpoint, object_id, required_fields)
+            for object_id in object_ids
+        }
+        missing = [object_id for object_id, obj in objects.items() if obj is None]
+        if missing and Methods.LIST in endpoint.methods:
+            listed = {
+                obj["id"]: obj
+                for obj in get_endpoint_data(app=self.app, endpoint=endpoint)
+            }
+            for object_id in missing:
+                obj = listed.get(object_id)
+                if obj is not None and all(field in obj for field in required_fields):
+                    objects[object_id] = obj
+        for object_id, obj in objects.items():
+            if obj is None:
+                objects[object_id] = get_object_data(
+                    app=self.app, endpoint=endpoint, object_id=object_id
                 )
+        return list(objects.values())
@@ -8,6 +8,7 @@ import attr
 import pytest
 from _pytest.mark.structures import ParameterSet
 
+from tests.test_data.datasets_cache import cached_dataset
 from tests.utils.api_objects import Request, ExpectedResponse
 from tests.utils.endpoints import Endpoints
 from tests.utils.methods import Methods
@@ -70,6 +71,7 @@ def _fill_pytest_param(
     return pytest.param(value, marks=marks, id=param_id)
 
 
+@cached_dataset
 def get_data_for_methods_check():
     """
     Get test data for allowed methods test
@@ -97,6 +99,7 @@ def get_data_for_methods_check():
     return test_data
 
 
+@cached_dataset
 def get_positive_data_for_post_body_check():
     """
     Generates positive datasets for POST method
@@ -126,6 +129,7 @@ def get_positive_data_for_post_body_check():
     return get_data_for_body_check(Methods.POST, test_sets, positive=True)
 
 
+@cached_dataset
 def get_negative_data_for_post_body_check():
     """
     Generates negative datasets for POST method
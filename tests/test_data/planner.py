@@ -0,0 +1,44 @@
+"""Planning of bulk data creation based on data classes dependencies"""
+from graphlib import TopologicalSorter
+from typing import Dict, List, Set, Tuple, Type
+
+from tests.utils.data_classes import BaseClass
+from tests.utils.endpoints import Endpoints
+
+
+def get_dependencies(data_class: Type[BaseClass]) -> Set[Type[BaseClass]]:
+    """Data classes that must exist before data_class object creation"""
+    fk_links = {field.f_type.fk_link for field in data_class.schema.fk_fields}
+    return fk_links | set(data_class.implicitly_depends_on)
+
+
+def plan_creation(endpoint: Endpoints, count: int) -> List[List[Tuple[Endpoints, int]]]:
+    """
+    Return layers of (endpoint, required objects count) pairs in creation order
+    Endpoints of one layer do not depend on each other.
+    Dependencies are shared by all created objects, so one object of each is enough.
+    """
+    required: Dict[Type[BaseClass], int] = {endpoint.data_class: count}
+    graph = {}
+    to_visit = [endpoint.data_class]
+    while to_visit:
+        data_class = to_visit.pop()
+        graph[data_class] = get_dependencies(data_class)
+        for dependency in graph[data_class]:
+            required.setdefault(dependency, 1)
+            if dependency not in graph:
+                to_visit.append(dependency)
+
+    sorter = TopologicalSorter(graph)
+    sorter.prepare()
+    layers = []
+    while sorter.is_active():
+        layer = sorter.get_ready()
+        layers.append(
+            [
+                (Endpoints.get_by_data_class(data_class), required[data_class])
+                for data_class in sorted(layer, key=lambda x: x.__name__)
+            ]
+        )
+        sorter.done(*layer)
+    return layers
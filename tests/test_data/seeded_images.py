@@ -0,0 +1,85 @@
+"""
+APP images with pre-seeded datasets
+Dataset is created once by DbFiller in container of initialized image and committed,
+so tests that need existing objects start with them instead of creating them over HTTP.
+Seeded images are cached like initialized ones (see image_cache module),
+image tag depends on all modules this one depends on (see datasets_cache module).
+"""
+import hashlib
+from typing import Tuple
+
+import allure
+import attr
+import docker
+
+from tests.test_data.datasets_cache import dataset_sources
+from tests.test_data.db_filler import DbFiller
+from tests.utils.docker import DockerWrapper
+from tests.utils.endpoints import Endpoints
+from tests.utils.image_cache import cached_image, images_key
+from tests.utils.methods import Methods
+from tests.utils.values import values
+
+
+@attr.dataclass(frozen=True)
+class DatasetSpec:
+    """
+    Dataset of seeded image
+    :attribute objects_per_endpoint: count of objects of each endpoint with POST method,
+                                      FKs are distributed over objects of linked endpoints
+    """
+
+    objects_per_endpoint: int = 3
+
+    def __str__(self):
+        return f"{self.objects_per_endpoint} objects per endpoint"
+
+
+DEFAULT_DATASET_SPEC = DatasetSpec()
+
+
+def schema_hash() -> str:
+    """Hash of sources that define how dataset is created"""
+    sha = hashlib.sha256()
+    for source in dataset_sources(__name__):
+        sha.update(source.name.encode("utf-8"))
+        sha.update(source.read_bytes())
+    return sha.hexdigest()
+
+
+def get_seeded_app_image(
+    image: Tuple[str, str], spec: DatasetSpec = DEFAULT_DATASET_SPEC, dc=None
+) -> Tuple[str, str]:
+    """
+    Return (repo, tag) of image with dataset seeded on top of initialized image,
+    image is built if there is no one for the same initialized image, spec and schema
+    """
+    if not dc:
+        dc = docker.from_env()
+    repo, base_tag = image
+    tag = "seed-" + images_key(base_tag, repr(spec), schema_hash())
+    seeded = cached_image(
+        dc, repo, tag, build=lambda: seed_app_image(image, spec, repo, tag)
+    )
+    return seeded["repo"], seeded["tag"]
+
+
+@allure.step("Seed APP image {repo}:{tag} with {spec}")
+def seed_app_image(image: Tuple[str, str], spec: DatasetSpec, repo: str, tag: str):
+    """Run APP from initialized image, create dataset and commit container as a new image"""
+    base_repo, base_tag = image
+    app = DockerWrapper().run_app(image=base_repo, tag=base_tag, remove=False)
+    try:
+        filler = DbFiller(app=app.api)
+        # dataset of the same tag is the same
+        with values.seeded(tag):
+            for endpoint in Endpoints:
+                if Methods.POST in endpoint.methods:
+                    filler.create_bulk(
+                        endpoint=endpoint, count=spec.objects_per_endpoint
+                    )
+        app.container.stop()
+        app.container.commit(repository=repo, tag=tag)
+    finally:
+        app.api.close()
+        app.container.remove(force=True)
@@ -0,0 +1,98 @@
+"""Fill APP DB by writing objects directly to its SQLite file"""
+import sqlite3
+import tempfile
+from pathlib import Path
+from typing import List, Tuple
+
+import allure
+
+from tests.test_data.db_filler import DbFiller
+from tests.utils.api_objects import DEFAULT_POOL_SIZE, APPApi
+from tests.utils.docker import APP
+from tests.utils.endpoints import Endpoints
+
+TABLES = {
+    Endpoints.Cluster: "clusters",
+    Endpoints.FileSystem: "file_systems",
+    Endpoints.Connection: "connections",
+    Endpoints.Backup: "backups",
+}
+INSERT_BATCH_SIZE = 10_000
+
+
+class SqliteDbFiller(DbFiller):
+    """
+    DbFiller that creates objects in bulk bypassing APP api, for volume tests
+    create_bulk() copies APP DB file from container, inserts rows planned the same way
+    as for HTTP path with batched executemany and puts the file back.
+    All other methods work over HTTP as in DbFiller.
+    :param app: APP api as for DbFiller
+    :param db: APP container that app talks to, create_bulk() works over HTTP if None
+    """
+
+    __slots__ = ("_docker_app", "_db")
+
+    def __init__(self, app: APPApi, db: APP = None):
+        super().__init__(app=app)
+        self._docker_app = db
+        self._db = None
+
+    @allure.step("Create at least {count} objects for {endpoint} in APP DB file")
+    def create_bulk(
+        self, endpoint: Endpoints, count: int, max_in_flight=DEFAULT_POOL_SIZE
+    ) -> list:
+        """
+        Create objects so that endpoint has at least "count" of them and return endpoint data
+        APP DB file is replaced, so objects cache is cleared
+        """
+        if self._docker_app is None:
+            return super().create_bulk(
+                endpoint=endpoint, count=count, max_in_flight=max_in_flight
+            )
+        content, db_member = self._docker_app.read_db()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = Path(tmp_dir) / "arenadata_db.sqlite"
+            db_path.write_bytes(content)
+            self._db = sqlite3.connect(db_path)
+            try:
+                # DB file is a copy, so durability is not needed until it is put back
+                self._db.execute("PRAGMA journal_mode = MEMORY")
+                self._db.execute("PRAGMA synchronous = OFF")
+                self._db.execute("PRAGMA foreign_keys = ON")
+                with self._db:
+                    data = super().create_bulk(
+                        endpoint=endpoint, count=count, max_in_flight=max_in_flight
+                    )
+            finally:
+                self._db.close()
+                self._db = None
+            self._docker_app.write_db(db_path.read_bytes(), db_member)
+        return data
+
+    def _get_endpoint_data(self, endpoint: Endpoints) -> list:
+        """Read endpoint data from DB file copy while it is filled"""
+        if self._db is None:
+            return super()._get_endpoint_data(endpoint)
+        cursor = self._db.execute(f"SELECT * FROM {TABLES[endpoint]}")
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def _create_objects(
+        self, layer_data: List[Tuple[Endpoints, List[dict]]], max_in_flight: int
+    ):
+        """Insert objects to DB file copy"""
+        for endpoint, data_list in layer_data:
+            columns = list(data_list[0])
+            query = (
+                f"INSERT INTO {TABLES[endpoint]} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})"
+            )
+            for start in range(0, len(data_list), INSERT_BATCH_SIZE):
+                end = start + INSERT_BATCH_SIZE
+                self._db.executemany(
+                    query,
+                    [
+                        tuple(data[column] for column in columns)
+                        for data in data_list[start:end]
+                    ],
+                )
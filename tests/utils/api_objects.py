@@ -1,13 +1,31 @@
 """Module contains api objects for executing and checking requests"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from enum import Enum
+from typing import Dict, List, Tuple
 from urllib.parse import urlencode
 
 import allure
+import allure_commons
 import attr
+import requests
+from requests import Response
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from . import json_codec
 from .endpoints import Endpoints
 from .methods import Methods
-from .tools import attach_request_log
-from ..steps.asserts import status_code_should_be, body_should_be
+from .request_log import RequestLog
+from ..steps.asserts import (
+    BudgetExceededError,
+    body_should_be,
+    response_should_fit_budget,
+    status_code_should_be,
+)
+from ..steps.common import assume_step
 
 
 @attr.dataclass
@@ -24,21 +42,166 @@ class Request:
 
 @attr.dataclass
 class ExpectedResponse:
-    """Response to be expected. Checking the status code and body if present"""
+    """
+    Response to be expected. Checking the status code and body if present
+    :attribute ignore_fields: body keys that are not compared, e.g. generated "id"
+    :attribute partial_body: if True, only keys present in expected body are compared
+    :attribute fast_body: if True, body check stops at the first difference
+    :attribute max_latency_ms: latency budget, endpoint default is used if None
+    :attribute max_body_bytes: body size budget, endpoint default is used if None
+    """
 
     status_code: int
     body: dict = None
+    ignore_fields: tuple = ()
+    partial_body: bool = False
+    fast_body: bool = False
+    max_latency_ms: float = None
+    max_body_bytes: int = None
+
+
+class BudgetPolicy(Enum):
+    """
+    How response latency and body size budgets are enforced
+    FAIL: exceeded budget fails the test
+    SOFT: exceeded budget fails only its step (see assume_step), test goes on
+    OFF: budgets are not checked
+    """
+
+    FAIL = "fail"
+    SOFT = "soft"
+    OFF = "off"
+
+
+class APPResponse:
+    """
+    Response of APP with JSON body decoded once on first json() call
+    Decoded body is shared by all callers, so it should not be modified in place.
+    All other attributes are taken from wrapped requests.Response
+    """
+
+    __slots__ = ("response", "_json")
+
+    _not_decoded = object()
+
+    def __init__(self, response: Response):
+        self.response = response
+        self._json = self._not_decoded
+
+    def __getattr__(self, name):
+        return getattr(self.response, name)
+
+    def __repr__(self):
+        return repr(self.response)
+
+    def json(self):
+        """Return decoded JSON body"""
+        if self._json is self._not_decoded:
+            self._json = json_codec.loads(self.response.content)
+        return self._json
+
+
+class APIHook:
+    """
+    Base class for APPApi hooks
+    Hooks are called for each checked response and for each reset of APP DB
+    """
+
+    def after_response(self, request: Request, response: APPResponse):
+        """Called with each response before it is checked"""
+
+    def after_db_reset(self):
+        """Called when APP DB is restored to initial state"""
+
+
+def steps_reported() -> bool:
+    """Allure steps are reported only if some plugin listens to them (see --alluredir)"""
+    return bool(allure_commons.plugin_manager.hook.start_step.get_hookimpls())
+
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRIES = 3
+DEFAULT_TIMEOUT = (5, 30)
+JSON_HEADERS = {"Content-Type": "application/json"}
 
 
 class APPApi:
-    """APP api wrapper"""
+    """
+    APP api wrapper
+    All requests are sent over one pooled keep-alive session owned by the wrapper
+    :param pool_size: max number of kept-alive connections to APP
+    :param retries: retries count for failed connection attempts
+    :param timeout: (connect, read) timeout in seconds for each request
+    :param request_log: request logging to Allure, see RequestLog
+    :param budget_policy: enforcement of response budgets, see BudgetPolicy
+    :attribute hooks: list of APIHook instances
+    """
 
-    __slots__ = ("_url",)
+    __slots__ = (
+        "_url",
+        "_session",
+        "_pool_size",
+        "_retries",
+        "_timeout",
+        "_routes",
+        "request_log",
+        "budget_policy",
+        "hooks",
+    )
 
     _api_prefix = ""
 
-    def __init__(self, url="http://localhost:8000"):
+    def __init__(
+        self,
+        url="http://localhost:8000",
+        pool_size=DEFAULT_POOL_SIZE,
+        retries=DEFAULT_RETRIES,
+        timeout=DEFAULT_TIMEOUT,
+        request_log: RequestLog = None,
+        budget_policy=BudgetPolicy.SOFT,
+    ):
         self._url = url
+        self.request_log = request_log or RequestLog()
+        self.budget_policy = budget_policy
+        self.hooks = []
+        self._timeout = timeout
+        self._pool_size = pool_size
+        self._retries = retries
+        self._session = self.new_session()
+        self._routes = self._compile_routes()
+
+    def new_session(self, pool_size: int = None) -> requests.Session:
+        """
+        Return new keep-alive session with retries and pool size of the wrapper,
+        e.g. for a thread that sends requests concurrently with others
+        """
+        session = requests.Session()
+        # APP runs in local container, so proxy and netrc lookups from environment
+        # are useless and cost a full environment scan on every request
+        session.trust_env = False
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size or self._pool_size,
+            max_retries=Retry(
+                total=self._retries,
+                connect=self._retries,
+                read=0,
+                status=0,
+                backoff_factor=0.1,
+            ),
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def close(self):
+        """Close all pooled connections"""
+        self._session.close()
+
+    def notify_db_reset(self):
+        """Let hooks know that APP DB was restored to initial state"""
+        for hook in self.hooks:
+            hook.after_db_reset()
 
     @property
     def _base_url(self):
@@ -49,34 +212,135 @@ class APPApi:
         Execute HTTP request based on "request" argument.
         Assert response params amd values based on "expected_response" argument.
         """
-        url = self.get_url_for_endpoint(
-            endpoint=request.endpoint,
-            method=request.method,
-            object_id=request.object_id,
+        with self.step(request):
+            response = self.send(request)
+            self.check_response(request, response, expected_response)
+
+        return response
+
+    def send(self, request: Request, session: requests.Session = None) -> APPResponse:
+        """
+        Send HTTP request based on "request" argument without any checks
+        :param session: session to send request with, session of the wrapper if None
+        """
+        if request.data is None:
+            body, headers = None, request.headers
+        else:
+            body = json_codec.dumps(request.data)
+            headers = (
+                {**JSON_HEADERS, **request.headers} if request.headers else JSON_HEADERS
+            )
+        response = (session or self._session).request(
+            method=request.method.http_method,
+            url=self.get_url_for_endpoint(
+                endpoint=request.endpoint,
+                method=request.method,
+                object_id=request.object_id,
+            ),
+            params=request.url_params.copy(),
+            data=body,
+            headers=headers,
+            timeout=self._timeout,
         )
-        url_params = request.url_params.copy()
-
-        step_name = f"Send {request.method.name} {url.replace(self._base_url, '')}"
-        if url_params:
-            step_name += f"?{urlencode(url_params)}"
-        with allure.step(step_name):
-            response = request.method.function(
-                url=url,
-                params=url_params,
-                json=request.data,
-                headers=request.headers,
+        return APPResponse(response)
+
+    def check_response(
+        self,
+        request: Request,
+        response: APPResponse,
+        expected_response: ExpectedResponse,
+        check_budget=True,
+    ):
+        """
+        Log request, call hooks
+        and assert response based on "expected_response" argument
+        :param check_budget: if False, latency and body size budgets are not checked
+        """
+        self.request_log.log(response)
+        for hook in self.hooks:
+            hook.after_response(request, response)
+
+        status_code_should_be(
+            response=response, status_code=expected_response.status_code
+        )
+
+        if expected_response.body is not None:
+            body_should_be(
+                response=response,
+                expected_body=expected_response.body,
+                ignore_fields=expected_response.ignore_fields,
+                partial=expected_response.partial_body,
+                fast=expected_response.fast_body,
             )
 
-            attach_request_log(response)
+        if check_budget:
+            self._check_budget(request, response, expected_response)
 
-            status_code_should_be(
-                response=response, status_code=expected_response.status_code
+    def _check_budget(
+        self,
+        request: Request,
+        response: APPResponse,
+        expected_response: ExpectedResponse,
+    ):
+        if self.budget_policy is BudgetPolicy.OFF:
+            return
+        max_latency_ms = expected_response.max_latency_ms
+        if max_latency_ms is None:
+            max_latency_ms = request.endpoint.max_latency_ms
+        max_body_bytes = expected_response.max_body_bytes
+        if max_body_bytes is None:
+            max_body_bytes = request.endpoint.max_body_bytes
+        if max_latency_ms is None and max_body_bytes is None:
+            return
+        if self.budget_policy is BudgetPolicy.SOFT:
+            budget_context = assume_step(
+                "Soft budget check", exception=BudgetExceededError
+            )
+        else:
+            budget_context = nullcontext()
+        with budget_context:
+            response_should_fit_budget(
+                response=response,
+                max_latency_ms=max_latency_ms,
+                max_body_bytes=max_body_bytes,
             )
 
-            if expected_response.body is not None:
-                body_should_be(response=response, expected_body=expected_response.body)
+    def step(self, request: Request):
+        """
+        Return allure step context for request
+        Step name is built only if steps are reported
+        """
+        if not steps_reported():
+            return nullcontext()
+        return allure.step(self.get_step_name(request))
 
-        return response
+    def get_step_name(self, request: Request) -> str:
+        """Return allure step name for request"""
+        url = self.get_url_for_endpoint(
+            endpoint=request.endpoint,
+            method=request.method,
+            object_id=request.object_id,
+        )
+        step_name = f"Send {request.method.name} {url[len(self._base_url):]}"
+        if request.url_params:
+            step_name += f"?{urlencode(request.url_params)}"
+        return step_name
+
+    def _compile_routes(self) -> Dict[Tuple[Endpoints, Methods], Tuple[str, str]]:
+        """
+        Return route table with (URL prefix, URL suffix) for each (endpoint, method).
+        Suffix is None if URL has no object id
+        """
+        routes = {}
+        for endpoint in Endpoints:
+            for method in Methods:
+                path = method.url_template.format(name=endpoint.path, id="{id}")
+                prefix, id_placeholder, suffix = path.partition("{id}")
+                routes[(endpoint, method)] = (
+                    f"{self._base_url}{prefix}",
+                    suffix if id_placeholder else None,
+                )
+        return routes
 
     def get_url_for_endpoint(
         self, endpoint: Endpoints, method: Methods, object_id: int
@@ -84,13 +348,87 @@ class APPApi:
         """
         Return direct link for endpoint object
         """
-        if "{id}" in method.url_template:
-            if object_id is None:
-                raise ValueError(
-                    "Request template requires 'id', but 'request.object_id' is None"
-                )
-            url = method.url_template.format(name=endpoint.path, id=object_id)
-        else:
-            url = method.url_template.format(name=endpoint.path)
+        prefix, suffix = self._routes[(endpoint, method)]
+        if suffix is None:
+            return prefix
+        if object_id is None:
+            raise ValueError(
+                "Request template requires 'id', but 'request.object_id' is None"
+            )
+        return f"{prefix}{object_id}{suffix}"
+
+
+class AsyncAPPApi:
+    """
+    Concurrent batch executor for APP api
+    Requests of a batch are sent concurrently by "max_in_flight" worker threads,
+    each thread has its own session made by given APPApi, since requests.Session
+    is not guaranteed to be thread-safe. Threads and sessions are kept until close().
+    Responses are checked afterwards one by one in the order of the batch,
+    so allure steps and asserts stay the same as for APPApi.exec_request.
+    Budgets are not checked: concurrent requests compete for APP workers,
+    so their latency is not comparable with budgets of serial requests
+    """
+
+    __slots__ = ("_api", "_max_in_flight", "_executor", "_local", "_sessions")
+
+    def __init__(self, api: APPApi, max_in_flight=DEFAULT_POOL_SIZE):
+        self._api = api
+        self._max_in_flight = max_in_flight
+        self._local = threading.local()
+        self._sessions = []
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_in_flight, initializer=self._init_worker
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop worker threads and close their sessions"""
+        self._executor.shutdown(wait=True)
+        for session in self._sessions:
+            session.close()
+        self._sessions.clear()
+
+    def _init_worker(self):
+        self._local.session = self._api.new_session(pool_size=1)
+        self._sessions.append(self._local.session)
+
+    def _send(self, request: Request) -> APPResponse:
+        return self._api.send(request, session=self._local.session)
+
+    def exec_requests(
+        self,
+        batch: List[Tuple[Request, ExpectedResponse]],
+        step_titles: List[str] = None,
+    ) -> List[APPResponse]:
+        """
+        Execute all requests of the batch concurrently and assert responses
+        :param batch: list of independent (request, expected_response) pairs
+        :param step_titles: optional allure step titles to wrap each check into
+        """
+        responses = asyncio.run(self._send_batch([request for request, _ in batch]))
+        step_titles = step_titles or [None] * len(batch)
+        for (request, expected_response), response, title in zip(
+            batch, responses, step_titles
+        ):
+            with allure.step(title) if title else nullcontext():
+                with self._api.step(request):
+                    self._api.check_response(
+                        request, response, expected_response, check_budget=False
+                    )
+        return responses
+
+    async def _send_batch(self, requests_batch: List[Request]) -> List[APPResponse]:
+        loop = asyncio.get_running_loop()
+        in_flight = asyncio.Semaphore(self._max_in_flight)
+
+        async def send(request: Request) -> APPResponse:
+            async with in_flight:
+                return await loop.run_in_executor(self._executor, self._send, request)
 
-        return f"{self._base_url}{url}"
+        return await asyncio.gather(*(send(request) for request in requests_batch))
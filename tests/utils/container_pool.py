@@ -0,0 +1,130 @@
+"""Pool of warmed APP containers reused across tests"""
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import allure
+import requests
+from docker.errors import APIError, NotFound
+from retry.api import retry_call
+
+from .docker import APP, DbResetError, DockerWrapper
+
+
+class TimingCounter:
+    """Accumulates count, total and max duration of some operation"""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, duration: float):
+        """Add one operation duration in seconds"""
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+    def summary(self) -> dict:
+        """Return counter values as dict"""
+        return {
+            "count": self.count,
+            "total": round(self.total, 3),
+            "avg": round(self.total / self.count, 3) if self.count else 0.0,
+            "max": round(self.max, 3),
+        }
+
+
+class ContainerPool:
+    """
+    Pool of started APP containers of one pytest process (xdist worker)
+    Container is checked out for a test and returned back after it.
+    On return DB of container is restored with APP.reset_db() from snapshot made right
+    after container start, so next test gets APP in the same state as a fresh container.
+    Containers that can not be reset are killed and replaced with new ones.
+    """
+
+    __slots__ = ("_dw", "_repo", "_tag", "_size", "_idle", "stats")
+
+    def __init__(self, image, size: int):
+        self._dw = DockerWrapper()
+        self._repo, self._tag = image
+        self._size = size
+        self._idle = deque()
+        self.stats = {
+            "start": TimingCounter(),
+            "readiness": TimingCounter(),
+            "checkout": TimingCounter(),
+            "reset": TimingCounter(),
+            "return": TimingCounter(),
+        }
+
+    def warm_up(self):
+        """Start containers until pool is full"""
+        while len(self._idle) < self._size:
+            self._idle.append(self._start())
+
+    def checkout(self) -> APP:
+        """Get ready to use APP container from pool"""
+        with self._timing("checkout"), allure.step("Checkout APP container from pool"):
+            if self._idle:
+                return self._idle.popleft()
+            return self._start()
+
+    def give_back(self, app: APP):
+        """Reset APP container and return it to pool"""
+        with self._timing("return"), allure.step(
+            f"Return APP container to pool: {app.container.id}"
+        ):
+            if len(self._idle) >= self._size:
+                self._kill(app)
+                return
+            try:
+                self.stats["reset"].add(app.reset_db())
+            except (DbResetError, APIError):
+                self._kill(app)
+                return
+            self._idle.append(app)
+
+    def close(self):
+        """Kill all idle containers"""
+        while self._idle:
+            self._kill(self._idle.popleft())
+
+    def stats_summary(self) -> dict:
+        """Return timing counters summary"""
+        return {name: counter.summary() for name, counter in self.stats.items()}
+
+    def _start(self) -> APP:
+        with self._timing("start"):
+            app = self._dw.run_app(image=self._repo, tag=self._tag)
+            self.stats["readiness"].add(app.readiness.latency)
+            try:
+                app.snapshot_db()
+            except APIError:
+                self._kill(app)
+                raise
+        return app
+
+    @staticmethod
+    def _kill(app: APP):
+        app.api.close()
+        try:
+            retry_call(
+                app.container.kill,
+                exceptions=requests.exceptions.ConnectionError,
+                tries=5,
+                delay=5,
+            )
+        except NotFound:
+            pass
+
+    @contextmanager
+    def _timing(self, name):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.stats[name].add(time.monotonic() - start)
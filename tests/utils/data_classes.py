@@ -1,10 +1,11 @@
 """Endpoint data classes definition"""
 
 from abc import ABC
-from typing import List
+from typing import ClassVar, List
 
 from .types import (
     Field,
+    Schema,
     PositiveInt,
     String,
     Text,
@@ -16,6 +17,11 @@ class BaseClass(ABC):
     """Base data class"""
 
     implicitly_depends_on: List["BaseClass"] = []
+    schema: ClassVar[Schema] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.schema = Schema(cls)
 
 
 class ClusterFields(BaseClass):
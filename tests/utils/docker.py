@@ -1,16 +1,25 @@
 """Module helps to run APP in docker"""
+import copy
+import hashlib
 import io
+import os
 import random
 import socket
+import tarfile
+import tempfile
+import time
 from contextlib import contextmanager
-from gzip import compress
+from fnmatch import fnmatch
+from typing import Tuple
 
 import allure
 import docker
-from docker.errors import APIError, ImageNotFound
+import requests
+from docker.errors import APIError, ImageNotFound, NotFound
 
 from .api_objects import APPApi
-from .tools import wait_for_url, random_string
+from .image_cache import cached_image, images_key, migrations_hash, source_image_id
+from .readiness import Readiness, wait_for_ready
 
 MIN_DOCKER_PORT = 8000
 MAX_DOCKER_PORT = 9000
@@ -18,6 +27,11 @@ DEFAULT_IP = "127.0.0.1"
 CONTAINER_START_RETRY_COUNT = 20
 DEFAULT_IMAGE = "app"
 DEFAULT_TAG = "latest"
+APP_STORAGE_PATH = "/var/www/html/storage/app/"
+APP_DB_PATH = f"{APP_STORAGE_PATH}arenadata_db.sqlite"
+GATHER_MAX_SIZE = 100 * 1024 * 1024
+# Containers are labelled with pid of pytest process (xdist worker) that started them
+OWNER_LABEL = "app-tests.owner"
 
 
 class UnableToBind(Exception):
@@ -28,6 +42,10 @@ class RetryCountExceeded(Exception):
     """Raise when container was not started"""
 
 
+class DbResetError(Exception):
+    """Raise when APP DB can not be restored from snapshot"""
+
+
 def _port_is_free(ip, port):
     sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     result = sock.connect_ex((ip, port))
@@ -50,17 +68,98 @@ class APP:
     and wraps docker over self.container (see docker module for info)
     """
 
-    def __init__(self, container, ip, port):
+    def __init__(self, container, ip, port, readiness: Readiness = None):
         self.container = container
+        self.readiness = readiness
         self.ip = ip
         self.port = port
         self.url = "http://{}:{}".format(self.ip, self.port)
         self.api = APPApi(self.url)
+        self._db_snapshot = None
 
     def stop(self):
         """Stops container"""
+        self.api.close()
         self.container.stop()
 
+    def read_db(self) -> Tuple[bytes, tarfile.TarInfo]:
+        """Return current APP DB file content and its tar metadata (owner, mode etc.)"""
+        bits, _ = self.container.get_archive(APP_DB_PATH)
+        with tarfile.open(fileobj=io.BytesIO(b"".join(bits))) as tar:
+            member = tar.next()
+            return tar.extractfile(member).read(), member
+
+    def write_db(self, content: bytes, member: tarfile.TarInfo):
+        """Replace APP DB file with given content keeping metadata from read_db() and check it"""
+        info = copy.copy(member)
+        info.size = len(content)
+        info.mtime = time.time()
+        archive = io.BytesIO()
+        with tarfile.open(fileobj=archive, mode="w") as tar:
+            tar.addfile(info, io.BytesIO(content))
+        self._put_db_archive(
+            archive.getvalue(),
+            f"{member.uid}:{member.gid}",
+            checksum=hashlib.md5(content).hexdigest(),
+        )
+
+    def snapshot_db(self):
+        """Save current APP DB file in memory as a state to restore with reset_db()"""
+        bits, _ = self.container.get_archive(APP_DB_PATH)
+        archive = b"".join(bits)
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            member = tar.next()
+            checksum = hashlib.md5(tar.extractfile(member).read()).hexdigest()
+        self._db_snapshot = {
+            "archive": archive,
+            "checksum": checksum,
+            "owner": f"{member.uid}:{member.gid}",
+        }
+
+    def reset_db(self) -> float:
+        """
+        Restore APP DB file from snapshot made by snapshot_db() and check its checksum.
+        PHP opens DB on every request, so there is no need to restart anything.
+        Returns reset duration in seconds
+        """
+        if self._db_snapshot is None:
+            raise DbResetError("There is no DB snapshot, call snapshot_db() first")
+        start = time.monotonic()
+        with allure.step(f"Reset DB of APP container: {self.container.id}"):
+            self._put_db_archive(
+                self._db_snapshot["archive"],
+                self._db_snapshot["owner"],
+                checksum=self._db_snapshot["checksum"],
+            )
+            duration = time.monotonic() - start
+            allure.attach(
+                f"{duration * 1000:.1f} ms",
+                name="DB reset duration",
+                attachment_type=allure.attachment_type.TEXT,
+            )
+        return duration
+
+    def _put_db_archive(self, archive: bytes, owner: str, checksum: str):
+        """
+        Put tar archive with DB file to container, restore owner of DB file
+        and compare its checksum with expected one. Hooks of api are notified,
+        since all objects known before are gone
+        """
+        if not self.container.put_archive(os.path.dirname(APP_DB_PATH), archive):
+            raise DbResetError("Unable to put DB file to APP container")
+        # Docker extracts archive as root, so the owner has to be restored
+        exit_code, output = self.container.exec_run(
+            ["sh", "-c", f"chown {owner} {APP_DB_PATH} && md5sum {APP_DB_PATH}"]
+        )
+        if exit_code != 0:
+            raise DbResetError(f"Unable to check DB file: {output}")
+        actual_checksum = output.decode("utf-8").split()[0]
+        if actual_checksum != checksum:
+            raise DbResetError(
+                f"DB checksum {actual_checksum} differs from expected checksum {checksum}"
+            )
+        self.api.notify_db_reset()
+
 
 class DockerWrapper:
     """Allow connecting to local docker daemon and spawn APP instances."""
@@ -88,8 +187,17 @@ class DockerWrapper:
             image=image, remove=remove, name=name, tag=tag, ip=ip, volumes=volumes
         )
 
-        wait_for_url("http://{}:{}/api/v1/".format(ip, port), 60)
-        return APP(container, ip, port)
+        with allure.step("Wait for APP readiness"):
+            readiness = wait_for_ready(
+                "http://{}:{}/api/v1/".format(ip, port), 60, container=container
+            )
+            allure.attach(
+                f"{readiness.latency * 1000:.1f} ms after {readiness.attempts} probes, "
+                f"signalled by {readiness.signal}",
+                name="Readiness latency",
+                attachment_type=allure.attachment_type.TEXT,
+            )
+        return APP(container, ip, port, readiness=readiness)
 
     def app_container(
         self, image=None, remove=True, name=None, tag=None, ip=None, volumes=None
@@ -109,6 +217,7 @@ class DockerWrapper:
                         remove=remove,
                         detach=True,
                         name=name,
+                        labels={OWNER_LABEL: container_owner()},
                     )
                 break
             except APIError as err:
@@ -128,33 +237,121 @@ class DockerWrapper:
         return container, port
 
 
-@contextmanager
-def gather_app_data_from_container(app):
-    """Get archived data from APP container and return it compressed"""
-    bits, _ = app.container.get_archive("/var/www/html/storage/app/")
+def container_owner() -> str:
+    """Owner label value of containers started by current process"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def leftover_containers(dc=None, timeout=30) -> list:
+    """
+    Return containers started by current process that are still there,
+    containers being removed are waited for up to timeout seconds each
+    """
+    if not dc:
+        dc = docker.from_env()
+    owner_filter = {"label": f"{OWNER_LABEL}={container_owner()}"}
+    for container in dc.containers.list(all=True, filters=owner_filter):
+        try:
+            container.wait(condition="removed", timeout=timeout)
+        except (requests.exceptions.RequestException, NotFound):
+            # removed meanwhile, timed out or hit
+            # https://github.com/docker/docker-py/issues/1966
+            pass
+    return dc.containers.list(all=True, filters=owner_filter)
+
+
+class _ChunksReader(io.RawIOBase):
+    """Read-only file object over iterator of bytes chunks"""
+
+    def __init__(self, chunks):
+        super().__init__()
+        self._chunks = iter(chunks)
+        self._chunk = memoryview(b"")
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._chunk:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._chunk = memoryview(chunk)
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
+
+
+def _should_gather(name: str, include=None, exclude=None) -> bool:
+    if include and not any(fnmatch(name, pattern) for pattern in include):
+        return False
+    return not (exclude and any(fnmatch(name, pattern) for pattern in exclude))
 
-    with io.BytesIO() as stream:
-        for chunk in bits:
-            stream.write(chunk)
-        stream.seek(0)
-        yield compress(stream.getvalue())
+
+@contextmanager
+def gather_app_data_from_container(
+    app, include=None, exclude=None, max_size=GATHER_MAX_SIZE
+):
+    """
+    Get archived data from APP container and return path to compressed archive
+    Tar stream from container is repacked file by file into gzipped temporary file,
+    so memory usage does not depend on data size.
+    :param include: glob patterns of archive member names to gather, all by default
+    :param exclude: glob patterns of archive member names to skip
+    :param max_size: limit of gathered files total size in bytes,
+                     files above the limit are skipped and listed in archive
+    """
+    bits, _ = app.container.get_archive(APP_STORAGE_PATH)
+
+    skipped = []
+    gathered_size = 0
+    with tempfile.NamedTemporaryFile(suffix=".tgz") as archive:
+        with tarfile.open(
+            fileobj=_ChunksReader(bits), mode="r|"
+        ) as source, tarfile.open(fileobj=archive, mode="w|gz") as target:
+            for member in source:
+                if not _should_gather(member.name, include, exclude):
+                    continue
+                if not member.isfile():
+                    target.addfile(member)
+                    continue
+                if gathered_size + member.size > max_size:
+                    skipped.append(f"{member.name} ({member.size} bytes)")
+                    continue
+                gathered_size += member.size
+                target.addfile(member, source.extractfile(member))
+            if skipped:
+                note = "\n".join(
+                    [f"Skipped due to {max_size} bytes size limit:", *skipped]
+                ).encode("utf-8")
+                note_info = tarfile.TarInfo(name="GATHER_SKIPPED.txt")
+                note_info.size = len(note)
+                target.addfile(note_info, io.BytesIO(note))
+        archive.flush()
+        yield archive.name
 
 
 def get_initialized_app_image(
     repo="local/app", tag=None, app_repo=None, app_tag=None, dc=None
 ) -> dict:
     """
-    If we don't know tag image must be initialized, tag will be randomly generated.
+    If we don't know tag, it is derived from source image id and APP migrations,
+    so initialized image is reused until APP changes (see image_cache module).
     """
     if not dc:
         dc = docker.from_env()
 
     if tag and image_exists(repo, tag, dc):
         return {"repo": repo, "tag": tag}
-    else:
-        if not tag:
-            tag = random_string()
-        return init_app(repo, tag, app_repo, app_tag)
+    if not tag:
+        tag = "init-" + images_key(
+            source_image_id(dc, app_repo or DEFAULT_IMAGE, app_tag or DEFAULT_TAG),
+            migrations_hash(),
+        )
+    return cached_image(
+        dc, repo, tag, build=lambda: init_app(repo, tag, app_repo, app_tag)
+    )
 
 
 def init_app(repo, tag, app_repo, app_tag):
@@ -1,7 +1,7 @@
 """APP Endpoints classes and methods"""
 
 from enum import Enum
-from typing import List, Type, Optional
+from typing import Dict, List, Optional, Tuple, Type
 
 import attr
 
@@ -13,7 +13,10 @@ from .data_classes import (
     BaseClass,
 )
 from .methods import Methods
-from .types import get_fields
+
+DEFAULT_MAX_LATENCY_MS = 1000
+# Endpoint budgets apply to all methods, so body budget is set by LIST of all objects
+DEFAULT_MAX_BODY_BYTES = 2 ** 20
 
 
 @attr.dataclass
@@ -23,11 +26,15 @@ class Endpoint:
     :attribute path: endpoint name
     :attribute methods: list of allowed methods for endpoint
     :attribute data_class: endpoint fields specification
+    :attribute max_latency_ms: default latency budget of endpoint responses
+    :attribute max_body_bytes: default body size budget of endpoint responses
     """
 
     path: str
     methods: List[Methods]
     data_class: Type[BaseClass]
+    max_latency_ms: Optional[float] = None
+    max_body_bytes: Optional[int] = None
 
 
 class Endpoints(Enum):
@@ -51,25 +58,31 @@ class Endpoints(Enum):
         """Getter for Endpoint.data_class attribute"""
         return self.endpoint.data_class
 
+    @property
+    def max_latency_ms(self):
+        """Getter for Endpoint.max_latency_ms attribute"""
+        return self.endpoint.max_latency_ms
+
+    @property
+    def max_body_bytes(self):
+        """Getter for Endpoint.max_body_bytes attribute"""
+        return self.endpoint.max_body_bytes
+
     @classmethod
     def get_by_data_class(cls, data_class: Type[BaseClass]) -> Optional["Endpoints"]:
         """Get endpoint instance by data class"""
-        for endpoint in cls:
-            if endpoint.data_class == data_class:
-                return endpoint
-        return None
+        return _ENDPOINTS_BY_DATA_CLASS.get(data_class)
 
     def get_child_endpoint_by_fk_name(self, field_name: str) -> Optional["Endpoints"]:
         """Get endpoint instance by data class"""
-        for field in get_fields(self.value.data_class):
-            if field.name == field_name:
-                try:
-                    return self.get_by_data_class(field.f_type.fk_link)
-                except AttributeError:
-                    raise ValueError(
-                        f"Field {field_name} must be a Foreign Key field type"
-                    ) from AttributeError
-        return None
+        if field_name not in self.data_class.schema.by_name:
+            return None
+        try:
+            return _CHILD_ENDPOINTS[(self, field_name)]
+        except KeyError:
+            raise ValueError(
+                f"Field {field_name} must be a Foreign Key field type"
+            ) from None
 
     Cluster = Endpoint(
         path="cluster",
@@ -79,6 +92,8 @@ class Endpoints(Enum):
             Methods.POST,
         ],
         data_class=ClusterFields,
+        max_latency_ms=DEFAULT_MAX_LATENCY_MS,
+        max_body_bytes=DEFAULT_MAX_BODY_BYTES,
     )
 
     FileSystem = Endpoint(
@@ -89,6 +104,8 @@ class Endpoints(Enum):
             Methods.POST,
         ],
         data_class=FileSystemFields,
+        max_latency_ms=DEFAULT_MAX_LATENCY_MS,
+        max_body_bytes=DEFAULT_MAX_BODY_BYTES,
     )
 
     Connection = Endpoint(
@@ -99,6 +116,8 @@ class Endpoints(Enum):
             Methods.POST,
         ],
         data_class=ConnectionFields,
+        max_latency_ms=DEFAULT_MAX_LATENCY_MS,
+        max_body_bytes=DEFAULT_MAX_BODY_BYTES,
     )
 
     Backup = Endpoint(
@@ -109,4 +128,18 @@ class Endpoints(Enum):
             Methods.POST,
         ],
         data_class=BackupFields,
+        max_latency_ms=DEFAULT_MAX_LATENCY_MS,
+        max_body_bytes=DEFAULT_MAX_BODY_BYTES,
     )
+
+
+# Endpoints resolution maps are built once, first endpoint of data class wins
+_ENDPOINTS_BY_DATA_CLASS: Dict[Type[BaseClass], Endpoints] = {
+    endpoint.data_class: endpoint for endpoint in reversed(list(Endpoints))
+}
+
+_CHILD_ENDPOINTS: Dict[Tuple[Endpoints, str], Optional[Endpoints]] = {
+    (endpoint, field.name): _ENDPOINTS_BY_DATA_CLASS.get(field.f_type.fk_link)
+    for endpoint in Endpoints
+    for field in endpoint.data_class.schema.fk_fields
+}
@@ -0,0 +1,110 @@
+"""
+Content-addressed cache of APP images committed from initialized containers
+Image tag is derived from its sources, so image is built only when sources change
+and then reused across sessions and xdist workers. Builds are serialized with
+file lock, least recently used images above the limit are removed.
+Lock and index are kept in temp dir of the host, so they are shared by sessions
+of all checkouts that use the same local docker daemon.
+"""
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable
+
+from docker.errors import APIError, ImageNotFound
+
+IMAGES_DIR = Path(tempfile.gettempdir()) / "app-tests-images"
+IMAGES_KEEP = 5
+MIGRATIONS_DIR = Path(__file__).parent.parent.parent / "app" / "database" / "migrations"
+
+
+def migrations_hash() -> str:
+    """Hash of APP DB migrations, initialized DB depends on them"""
+    sha = hashlib.sha256()
+    if MIGRATIONS_DIR.is_dir():
+        for migration in sorted(MIGRATIONS_DIR.iterdir()):
+            sha.update(migration.name.encode("utf-8"))
+            sha.update(migration.read_bytes())
+    return sha.hexdigest()
+
+
+def source_image_id(dc, repo, tag) -> str:
+    """Return content id of source image, pull it if there is no such image locally"""
+    try:
+        return dc.images.get(f"{repo}:{tag}").id
+    except ImageNotFound:
+        return dc.images.pull(repo, tag=tag).id
+
+
+def images_key(*parts: str) -> str:
+    """Return short hash of image sources"""
+    sha = hashlib.sha256()
+    for part in parts:
+        sha.update(part.encode("utf-8"))
+        sha.update(b"\0")
+    return sha.hexdigest()[:16]
+
+
+@contextmanager
+def images_lock():
+    """Exclusive lock of images cache shared by all sessions and xdist workers"""
+    IMAGES_DIR.mkdir(parents=True, exist_ok=True)
+    with (IMAGES_DIR / "lock").open("w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _load_index() -> dict:
+    """Return last use time of each cached image name"""
+    try:
+        return json.loads((IMAGES_DIR / "index.json").read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_index(index: dict):
+    with tempfile.NamedTemporaryFile("w", dir=IMAGES_DIR, delete=False) as file:
+        json.dump(index, file, indent=2)
+    os.replace(file.name, IMAGES_DIR / "index.json")
+
+
+def _collect_garbage(dc, index: dict, keep: int):
+    """Remove least recently used images above keep limit, images in use are kept"""
+    for name in sorted(index, key=index.get, reverse=True)[keep:]:
+        if dc.containers.list(all=True, filters={"ancestor": name}):
+            continue
+        try:
+            dc.images.remove(name)
+        except ImageNotFound:
+            pass
+        except APIError:
+            # image is used by another image or by container started meanwhile
+            continue
+        del index[name]
+
+
+def cached_image(dc, repo, tag, build: Callable, keep=IMAGES_KEEP) -> dict:
+    """
+    Return image with given repo and tag, call build() to create it if there is no such image
+    :param build: callable that commits image with given repo and tag
+    :param keep: count of most recently used cached images kept by garbage collector
+    """
+    name = f"{repo}:{tag}"
+    with images_lock():
+        try:
+            dc.images.get(name)
+        except ImageNotFound:
+            build()
+        index = _load_index()
+        index[name] = time.time()
+        _collect_garbage(dc, index, keep)
+        _save_index(index)
+    return {"repo": repo, "tag": tag}
@@ -0,0 +1,31 @@
+"""JSON encoding and decoding with orjson if it is installed"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: bytes):
+    """Decode JSON document"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj) -> bytes:
+    """Encode object to compact JSON document"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # orjson is strict about key types and integers range,
+            # such bodies are left to standard encoder
+            pass
+    return json.dumps(obj).encode("utf-8")
+
+
+def pretty(obj) -> str:
+    """Encode object to human readable JSON document"""
+    return json.dumps(obj, indent=2)
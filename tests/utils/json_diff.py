@@ -0,0 +1,100 @@
+"""Structural diff of decoded JSON documents"""
+from typing import Collection, List
+
+ROOT = "$"
+_CONTAINERS = (dict, list)
+
+
+def _path(node) -> str:
+    """Format path from linked (parent, key) node"""
+    keys = []
+    while node is not None:
+        node, key = node
+        keys.append(f"[{key}]" if isinstance(key, int) else f".{key}")
+    return ROOT + "".join(reversed(keys))
+
+
+def _type_name(value) -> str:
+    if isinstance(value, dict):
+        return "object"
+    if isinstance(value, list):
+        return "array"
+    return repr(value)
+
+
+def _mismatch(node, actual, expected) -> str:
+    return f"{_path(node)}: expected {expected!r}, got {actual!r}"
+
+
+def json_diff(
+    actual,
+    expected,
+    ignore_fields: Collection[str] = (),
+    partial=False,
+    fast=False,
+) -> List[str]:
+    """
+    Return list of differences between actual and expected JSON documents,
+    each is a path to mismatched value, e.g. "$[3].name", with description.
+    Trees are walked once with explicit stack, paths are formatted only for mismatches.
+    :param ignore_fields: object keys that are not compared at any depth, e.g. "id"
+    :param partial: if True, keys of actual objects that are absent in expected are allowed
+    :param fast: if True, stop at the first difference
+    """
+    if not ignore_fields and not partial and actual == expected:
+        return []
+    if not isinstance(actual, _CONTAINERS) and not isinstance(expected, _CONTAINERS):
+        return [] if actual == expected else [_mismatch(None, actual, expected)]
+
+    ignore_fields = frozenset(ignore_fields)
+    differences = []
+    # path nodes are (parent node, key) pairs, root node is None
+    stack = [(actual, expected, None)]
+    while stack:
+        actual, expected, node = stack.pop()
+        nested = []
+        if isinstance(expected, dict) and isinstance(actual, dict):
+            for key, expected_value in expected.items():
+                if key in ignore_fields:
+                    continue
+                try:
+                    actual_value = actual[key]
+                except KeyError:
+                    differences.append(f"{_path((node, key))}: missing")
+                    continue
+                # scalars are compared in place, only containers go to the stack
+                if isinstance(actual_value, _CONTAINERS) or isinstance(
+                    expected_value, _CONTAINERS
+                ):
+                    nested.append((actual_value, expected_value, (node, key)))
+                elif actual_value != expected_value:
+                    differences.append(
+                        _mismatch((node, key), actual_value, expected_value)
+                    )
+            if not partial and actual.keys() != expected.keys():
+                for key in actual.keys() - expected.keys() - ignore_fields:
+                    differences.append(f"{_path((node, key))}: unexpected")
+        elif isinstance(expected, list) and isinstance(actual, list):
+            if len(actual) != len(expected):
+                differences.append(
+                    f"{_path(node)}: expected {len(expected)} items, got {len(actual)}"
+                )
+            for index, (actual_value, expected_value) in enumerate(
+                zip(actual, expected)
+            ):
+                if isinstance(actual_value, _CONTAINERS) or isinstance(
+                    expected_value, _CONTAINERS
+                ):
+                    nested.append((actual_value, expected_value, (node, index)))
+                elif actual_value != expected_value:
+                    differences.append(
+                        _mismatch((node, index), actual_value, expected_value)
+                    )
+        else:
+            differences.append(
+                f"{_path(node)}: expected {_type_name(expected)}, got {_type_name(actual)}"
+            )
+        if fast and differences:
+            return differences[:1]
+        stack.extend(reversed(nested))
+    return differences
@@ -1,17 +1,15 @@
 """Possible Methods specification"""
-from collections.abc import Callable
 from enum import Enum
 from http import HTTPStatus
 
 import attr
-import requests
 
 
 @attr.dataclass
 class Method:
     """Describe possible methods and how they are used in APP api"""
 
-    function: Callable
+    http_method: str
     url_template: str
     default_success_code: int = HTTPStatus.OK
 
@@ -23,9 +21,9 @@ class Methods(Enum):
         self.method = method
 
     @property
-    def function(self):
-        """Getter for Method.function attribute"""
-        return self.method.function
+    def http_method(self):
+        """Getter for Method.http_method attribute"""
+        return self.method.http_method
 
     @property
     def url_template(self):
@@ -37,10 +35,10 @@ class Methods(Enum):
         """Getter for Method.default_success_code attribute"""
         return self.method.default_success_code
 
-    GET = Method(function=requests.get, url_template="/{name}/{id}/")
-    LIST = Method(function=requests.get, url_template="/{name}/")
+    GET = Method(http_method="GET", url_template="/{name}/{id}/")
+    LIST = Method(http_method="GET", url_template="/{name}/")
     POST = Method(
-        function=requests.post,
+        http_method="POST",
         url_template="/{name}/",
         default_success_code=HTTPStatus.CREATED,
     )
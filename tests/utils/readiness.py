@@ -0,0 +1,108 @@
+"""APP readiness detection"""
+import threading
+import time
+
+import attr
+import requests
+
+# Apache writes it to container log when it is ready to serve requests
+READY_LOG_SIGNAL = "resuming normal operations"
+
+INITIAL_DELAY = 0.005
+MAX_DELAY = 0.5
+REQUEST_TIMEOUT = 2
+
+
+@attr.dataclass
+class Readiness:
+    """
+    Readiness wait result
+    :attribute latency: seconds from the start of waiting until APP became ready
+    :attribute attempts: count of probes made
+    :attribute signal: what signalled readiness - "http" or "health"
+    """
+
+    latency: float
+    attempts: int
+    signal: str
+
+
+class _LogWatcher:
+    """Sets event when ready signal appears in container log stream"""
+
+    __slots__ = ("event", "_stream", "_thread")
+
+    def __init__(self, container, signal=READY_LOG_SIGNAL):
+        self.event = threading.Event()
+        self._stream = container.logs(stream=True, follow=True)
+        self._thread = threading.Thread(target=self._watch, args=(signal,), daemon=True)
+        self._thread.start()
+
+    def _watch(self, signal):
+        try:
+            for line in self._stream:
+                if signal in line.decode("utf-8", errors="replace"):
+                    self.event.set()
+                    return
+        except Exception:
+            # Stream is closed by stop() or container is gone, HTTP probes will decide
+            pass
+
+    def stop(self):
+        """Close log stream"""
+        self._stream.close()
+
+
+def _health_status(container):
+    """Return docker health status or None if container image has no healthcheck"""
+    container.reload()
+    return container.attrs["State"].get("Health", {}).get("Status")
+
+
+def wait_for_ready(
+    url: str,
+    timeout=120,
+    container=None,
+    request_timeout=REQUEST_TIMEOUT,
+) -> Readiness:
+    """
+    Wait until APP becomes available by url
+    Probes are made with exponential backoff starting from a few milliseconds
+    and each probe has its own timeout, so total wait never exceeds "timeout" seconds.
+    If container is passed its log stream is watched for the ready signal, so probe
+    is made right after it appears, and docker health status is checked if present.
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    delay = INITIAL_DELAY
+    attempts = 0
+    watcher = _LogWatcher(container) if container is not None else None
+    check_health = container is not None and _health_status(container) is not None
+    session = requests.Session()
+    session.trust_env = False
+    try:
+        while True:
+            attempts += 1
+            if check_health and _health_status(container) == "healthy":
+                return Readiness(time.monotonic() - start, attempts, "health")
+            remaining = deadline - time.monotonic()
+            try:
+                session.get(url, timeout=max(min(request_timeout, remaining), 0.001))
+                return Readiness(time.monotonic() - start, attempts, "http")
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"No response from APP in {timeout} seconds")
+            if watcher is not None and watcher.event.wait(min(delay, remaining)):
+                # ready signal appeared, probe immediately and often again
+                watcher.event.clear()
+                delay = INITIAL_DELAY
+                continue
+            if watcher is None:
+                time.sleep(min(delay, remaining))
+            delay = min(delay * 2, MAX_DELAY)
+    finally:
+        session.close()
+        if watcher is not None:
+            watcher.stop()
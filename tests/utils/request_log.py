@@ -0,0 +1,67 @@
+"""Allure logging of APP requests"""
+from collections import deque
+from enum import Enum
+
+import allure
+from requests import Response
+
+from .tools import attach_request_log, request_log_dump
+
+DEFAULT_BUFFER_SIZE = 20
+DEFAULT_MAX_BODY_SIZE = 16 * 1024
+
+
+class RequestLogPolicy(Enum):
+    """
+    When request logs are attached to Allure report
+    ALWAYS: log of each request is attached to its step
+    ON_FAILURE: last requests are kept in memory and attached only if test fails
+    OFF: no request logs
+    """
+
+    ALWAYS = "always"
+    ON_FAILURE = "on-failure"
+    OFF = "off"
+
+
+class RequestLog:
+    """
+    Request log of APPApi
+    :param policy: when to attach request logs, see RequestLogPolicy
+    :param buffer_size: count of last requests kept for ON_FAILURE policy
+    :param max_body_size: max size in bytes of logged request and response bodies
+    """
+
+    __slots__ = ("policy", "_buffer", "_max_body_size")
+
+    def __init__(
+        self,
+        policy=RequestLogPolicy.ON_FAILURE,
+        buffer_size=DEFAULT_BUFFER_SIZE,
+        max_body_size=DEFAULT_MAX_BODY_SIZE,
+    ):
+        self.policy = policy
+        self._buffer = deque(maxlen=buffer_size)
+        self._max_body_size = max_body_size
+
+    def log(self, response: Response):
+        """Log request according to policy"""
+        if self.policy is RequestLogPolicy.ALWAYS:
+            attach_request_log(response, max_body_size=self._max_body_size)
+        elif self.policy is RequestLogPolicy.ON_FAILURE:
+            # dump is made only when it is needed
+            self._buffer.append(response)
+
+    def attach_buffered(self):
+        """Attach logs of last requests to Allure report and clear buffer"""
+        if not self._buffer:
+            return
+        allure.attach(
+            "\n\n".join(
+                request_log_dump(response, max_body_size=self._max_body_size)
+                for response in self._buffer
+            ),
+            name=f"Last {len(self._buffer)} requests log",
+            extension="txt",
+        )
+        self._buffer.clear()
@@ -0,0 +1,238 @@
+"""Per-request latency and size metrics of APP requests"""
+import json
+from math import ceil
+from typing import Dict, Tuple
+
+import allure
+
+from .api_objects import APIHook, APPResponse, Request
+from .traffic import current_traffic
+
+PERCENTILES = (50, 95, 99)
+
+# Histogram buckets are log-linear like in HDR histogram: each power of two range
+# is split into 2 ** SUB_BUCKET_BITS buckets, so relative error is below 1/64
+SUB_BUCKET_BITS = 6
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_LINEAR_LIMIT = _SUB_BUCKETS << 1
+
+
+def _bucket_index(value: int) -> int:
+    if value < _LINEAR_LIMIT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+
+def _bucket_highest_value(index: int) -> int:
+    if index < _LINEAR_LIMIT:
+        return index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    return ((index - (shift << SUB_BUCKET_BITS) + 1) << shift) - 1
+
+
+class Histogram:
+    """
+    Histogram of non-negative integer values with constant recording cost
+    and bounded relative error of percentiles
+    """
+
+    __slots__ = ("_counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self._counts = []
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value: int):
+        """Add one value"""
+        index = _bucket_index(value)
+        if index >= len(self._counts):
+            self._counts.extend([0] * (index + 1 - len(self._counts)))
+        self._counts[index] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: "Histogram"):
+        """Add all values of other histogram"""
+        if len(other._counts) > len(self._counts):
+            self._counts.extend([0] * (len(other._counts) - len(self._counts)))
+        for index, count in enumerate(other._counts):
+            self._counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, percent: float) -> int:
+        """Return value that is not exceeded by given percent of values"""
+        if not self.count:
+            return 0
+        target = max(ceil(self.count * percent / 100), 1)
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= target:
+                return min(_bucket_highest_value(index), self.max)
+        return self.max
+
+    def summary(self, scale=1) -> dict:
+        """Return count, mean, max and percentiles, values are divided by scale"""
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count / scale, 3) if self.count else 0,
+            **{
+                f"p{percent}": round(self.percentile(percent) / scale, 3)
+                for percent in PERCENTILES
+            },
+            "max": round((self.max or 0) / scale, 3),
+        }
+
+    def to_dict(self) -> dict:
+        """Return serializable histogram state"""
+        return {
+            "counts": [
+                [index, count] for index, count in enumerate(self._counts) if count
+            ],
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "Histogram":
+        """Restore histogram from to_dict() result"""
+        histogram = cls()
+        for index, count in state["counts"]:
+            if index >= len(histogram._counts):
+                histogram._counts.extend([0] * (index + 1 - len(histogram._counts)))
+            histogram._counts[index] = count
+        histogram.count = state["count"]
+        histogram.total = state["total"]
+        histogram.min = state["min"]
+        histogram.max = state["max"]
+        return histogram
+
+
+class RequestStats:
+    """Metrics of requests of one traffic tag, endpoint and method"""
+
+    __slots__ = ("latency_us", "request_bytes", "response_bytes", "statuses")
+
+    def __init__(self):
+        self.latency_us = Histogram()
+        self.request_bytes = Histogram()
+        self.response_bytes = Histogram()
+        self.statuses = {}
+
+    def record(self, response: APPResponse):
+        """Add metrics of one response"""
+        elapsed = response.elapsed
+        self.latency_us.record(elapsed.seconds * 1_000_000 + elapsed.microseconds)
+        self.request_bytes.record(len(response.request.body or b""))
+        self.response_bytes.record(len(response.content))
+        status = str(response.status_code)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def merge(self, other: "RequestStats"):
+        """Add all metrics of other stats"""
+        self.latency_us.merge(other.latency_us)
+        self.request_bytes.merge(other.request_bytes)
+        self.response_bytes.merge(other.response_bytes)
+        for status, count in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+
+    def summary(self) -> dict:
+        """Return percentiles of latency in ms and sizes in bytes and status counts"""
+        return {
+            "latency_ms": self.latency_us.summary(scale=1000),
+            "request_bytes": self.request_bytes.summary(),
+            "response_bytes": self.response_bytes.summary(),
+            "statuses": dict(sorted(self.statuses.items())),
+        }
+
+    def to_dict(self) -> dict:
+        """Return serializable stats state"""
+        return {
+            "latency_us": self.latency_us.to_dict(),
+            "request_bytes": self.request_bytes.to_dict(),
+            "response_bytes": self.response_bytes.to_dict(),
+            "statuses": self.statuses,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "RequestStats":
+        """Restore stats from to_dict() result"""
+        stats = cls()
+        stats.latency_us = Histogram.from_dict(state["latency_us"])
+        stats.request_bytes = Histogram.from_dict(state["request_bytes"])
+        stats.response_bytes = Histogram.from_dict(state["response_bytes"])
+        stats.statuses = dict(state["statuses"])
+        return stats
+
+
+class RequestMetrics(APIHook):
+    """
+    APPApi hook that records latency, request and response body sizes and status
+    of each response by traffic tag (see traffic module), endpoint and method.
+    One instance is meant to be shared by all APPApi of pytest process
+    """
+
+    __slots__ = ("_stats",)
+
+    def __init__(self):
+        self._stats: Dict[Tuple[str, str, str], RequestStats] = {}
+
+    def after_response(self, request: Request, response: APPResponse):
+        key = (current_traffic(), request.endpoint.path, request.method.name)
+        if (stats := self._stats.get(key)) is None:
+            stats = self._stats[key] = RequestStats()
+        stats.record(response)
+
+    def merge(self, other: "RequestMetrics"):
+        """Add all metrics of other instance, e.g. of xdist worker"""
+        for key, other_stats in other._stats.items():
+            self._stats.setdefault(key, RequestStats()).merge(other_stats)
+
+    def summary(self) -> dict:
+        """Return summaries by traffic tag and "METHOD endpoint" """
+        result = {}
+        for (tag, path, method), stats in sorted(self._stats.items()):
+            result.setdefault(tag, {})[f"{method} {path}"] = stats.summary()
+        return result
+
+    def to_dict(self) -> dict:
+        """Return serializable state, e.g. to pass it from xdist worker"""
+        return {"|".join(key): stats.to_dict() for key, stats in self._stats.items()}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "RequestMetrics":
+        """Restore metrics from to_dict() result"""
+        metrics = cls()
+        for key, stats in state.items():
+            metrics._stats[tuple(key.split("|"))] = RequestStats.from_dict(stats)
+        return metrics
+
+    def attach_summary(self):
+        """Attach summary to Allure report"""
+        if not self._stats:
+            return
+        allure.attach(
+            json.dumps(self.summary(), indent=2),
+            name="APP requests metrics",
+            attachment_type=allure.attachment_type.JSON,
+        )
+
+    def write_summary(self, path):
+        """Write summary to JSON file"""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.summary(), file, indent=2)
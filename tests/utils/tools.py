@@ -1,30 +1,10 @@
 """Some useful methods"""
-import random
-import string
 from itertools import repeat
-from time import sleep
 
-import requests
 import allure
 from requests_toolbelt.utils import dump
 
 
-def wait_for_url(url: str, timeout=120) -> None:
-    """Wait until url becomes available"""
-    for _ in range(timeout):
-        try:
-            requests.get(url)
-            return
-        except requests.exceptions.ConnectionError:
-            sleep(1)
-    raise TimeoutError(f"No response from APP in {timeout} seconds")
-
-
-def random_string(strlen=10):
-    """Generating a random string of a certain length"""
-    return "".join([random.choice(string.ascii_letters) for _ in range(strlen)])
-
-
 def split_tag(image_name):
     """Split docker image by image name and tag"""
     image = image_name.split(":", maxsplit=1)
@@ -86,10 +66,43 @@ def create_dicts_by_chain(keys_chain: list):
     return result
 
 
-def attach_request_log(response):
+def _truncate_body(body, max_size) -> str:
+    if body is None:
+        return ""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if len(body) > max_size:
+        truncated = len(body) - max_size
+        body = body[:max_size] + f"\n... truncated {truncated} bytes".encode("utf-8")
+    return body.decode("utf-8", errors="replace")
+
+
+def request_log_dump(response, max_body_size=None) -> str:
+    """
+    Return full HTTP request dump
+    If max_body_size is set, request and response bodies are truncated to it
+    """
+    if max_body_size is None:
+        return dump.dump_all(response).decode("utf-8")
+    request = response.request
+    return "\n".join(
+        [
+            f"< {request.method} {request.path_url} HTTP/1.1",
+            *(f"< {name}: {value}" for name, value in request.headers.items()),
+            "<",
+            _truncate_body(request.body, max_body_size),
+            f"> HTTP/1.1 {response.status_code} {response.reason}",
+            *(f"> {name}: {value}" for name, value in response.headers.items()),
+            ">",
+            _truncate_body(response.content, max_body_size),
+        ]
+    )
+
+
+def attach_request_log(response, max_body_size=None):
     """Attach full HTTP request dump to Allure report"""
     allure.attach(
-        dump.dump_all(response).decode("utf-8"),
+        request_log_dump(response, max_body_size=max_body_size),
         name="Full request log",
         extension="txt",
     )
@@ -0,0 +1,23 @@
+"""Traffic tags of APP requests, e.g. to tell data preparation from tested requests"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+TEST_TRAFFIC = "test"
+SETUP_TRAFFIC = "setup"
+
+_traffic_tag = ContextVar("traffic_tag", default=TEST_TRAFFIC)
+
+
+def current_traffic() -> str:
+    """Return tag of requests sent in current context"""
+    return _traffic_tag.get()
+
+
+@contextmanager
+def tagged_traffic(tag: str):
+    """Tag requests sent inside the context, e.g. SETUP_TRAFFIC for data preparation"""
+    token = _traffic_tag.set(tag)
+    try:
+        yield
+    finally:
+        _traffic_tag.reset(token)
@@ -1,13 +1,12 @@
 """Module contains all field types and special values"""
 from abc import ABC, abstractmethod
 from collections.abc import Callable
-from random import randint
-from typing import ClassVar, List, Type, Union
-from multipledispatch import dispatch
+from functools import cached_property
+from typing import ClassVar, Dict, List, Tuple, Type, Union
 
 import attr
 
-from tests.utils.tools import random_string
+from tests.utils.values import values
 
 # There is no circular import, because the import of the module is not yet completed at the moment,
 # and this allows you to resolve the conflict.
@@ -30,6 +29,7 @@ class PreparedFieldValue:
 
     generated_value: if True, value will be generated according to field type rules
                      when PreparedFieldValue value is requested via 'return_value' method
+                     (or 'return_changed_value' for PUT, PATCH)
     """
 
     value: object = None
@@ -39,7 +39,6 @@ class PreparedFieldValue:
 
     drop_key: bool = False
 
-    @dispatch(object)
     def return_value(self, pre_generated_value):
         """
         Return value in final view for fields in POST body tests
@@ -52,10 +51,7 @@ class PreparedFieldValue:
 
         return self.value
 
-    @dispatch(object, object, object)
-    def return_value(
-        self, dbfiller, current_field_value, changed_field_value
-    ):  # noqa: F811
+    def return_changed_value(self, dbfiller, current_field_value, changed_field_value):
         """
         Return value in final view for fields in PUT, PATCH body tests
         :param dbfiller: Object of class DbFiller. Required to create non-changeable fk fields
@@ -78,15 +74,20 @@ class PreparedFieldValue:
         return self.error_messages
 
 
-@attr.dataclass
+# Types have no attrs fields, so they are compared by identity
+@attr.dataclass(eq=False)
 class BaseType(ABC):
     """
     Base type of field
     Contains common methods and attributes for each types
     """
 
-    _sp_vals_positive: list = None
-    _sp_vals_negative: List[Union[object, Type["BaseType"], PreparedFieldValue]] = None
+    # Special values are computed on first use and memoized
+    # with functools.cached_property in child types
+    _sp_vals_positive: ClassVar[list] = None
+    _sp_vals_negative: ClassVar[
+        List[Union[object, Type["BaseType"], PreparedFieldValue]]
+    ] = None
 
     error_message_required: ClassVar[str] = "The {name} field is required."
     error_message_invalid_data: ClassVar[str] = ""
@@ -95,6 +96,10 @@ class BaseType(ABC):
     def generate(self, **kwargs):
         """Should generate and return one value for the current child type"""
 
+    def generate_many(self, count: int) -> list:
+        """Generate batch of values, child types should override it with bulk generation"""
+        return [self.generate() for _ in range(count)]
+
     def get_positive_values(self):
         """Positive values is:
         - boundary values
@@ -142,10 +147,17 @@ class PositiveInt(BaseType):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self._sp_vals_positive = [self._min_int32, self._max_int32]
-        self._sp_vals_negative = [
+        self.error_message_invalid_data = "A valid integer is required."
+
+    @cached_property
+    def _sp_vals_positive(self):
+        return [self._min_int32, self._max_int32]
+
+    @cached_property
+    def _sp_vals_negative(self):
+        return [
             3.14,
-            random_string(),
+            values.string(),
             PreparedFieldValue(
                 self._min_int32 - 1,
                 f_type=self,
@@ -159,10 +171,12 @@ class PositiveInt(BaseType):
                 ],
             ),
         ]
-        self.error_message_invalid_data = "A valid integer is required."
 
     def generate(self, **kwargs):
-        return randint(self._min_int32, self._max_int32)
+        return values.integer(self._min_int32, self._max_int32)
+
+    def generate_many(self, count: int) -> list:
+        return values.integers(count, self._min_int32, self._max_int32)
 
 
 class String(BaseType):
@@ -171,21 +185,29 @@ class String(BaseType):
     def __init__(self, max_length=255, **kwargs):
         super().__init__(**kwargs)
         self.max_length = max_length
-        self._sp_vals_positive = ["s", r"!@#$%^&*\/{}[]", random_string(max_length)]
+        self.error_message_invalid_data = "Not a valid string."
+
+    @cached_property
+    def _sp_vals_positive(self):
+        return ["s", r"!@#$%^&*\/{}[]", values.string(self.max_length)]
 
-        self._sp_vals_negative = [
+    @cached_property
+    def _sp_vals_negative(self):
+        return [
             PreparedFieldValue(
-                value=random_string(max_length + 1),
+                value=values.string(self.max_length + 1),
                 f_type=self,
                 error_messages=[
                     f"The {{name}} may not be greater than {self.max_length} characters."
                 ],
             ),
         ]
-        self.error_message_invalid_data = "Not a valid string."
 
     def generate(self, **kwargs):
-        return random_string(randint(1, self.max_length))
+        return values.string(values.integer(1, self.max_length))
+
+    def generate_many(self, count: int) -> list:
+        return values.strings(count, length=(1, self.max_length))
 
 
 class Text(BaseType):
@@ -196,19 +218,25 @@ class Text(BaseType):
     def __init__(self, max_length=2000, **kwargs):
         super().__init__(**kwargs)
         self.max_length = max_length
-        self._sp_vals_negative = [
+        self.error_message_invalid_data = ""
+
+    @cached_property
+    def _sp_vals_negative(self):
+        return [
             PreparedFieldValue(
-                value=random_string(max_length + 1),
+                value=values.string(self.max_length + 1),
                 f_type=self,
                 error_messages=[
                     f"The {{name}} may not be greater than {self.max_length} characters."
                 ],
             ),
         ]
-        self.error_message_invalid_data = ""
 
     def generate(self, **kwargs):
-        return random_string(randint(64, 200))
+        return values.string(values.integer(64, 200))
+
+    def generate_many(self, count: int) -> list:
+        return values.strings(count, length=(64, 200))
 
 
 class ForeignKey(BaseType):
@@ -219,7 +247,10 @@ class ForeignKey(BaseType):
     def __init__(self, fk_link: Type["data_classes.BaseClass"], **kwargs):
         self.fk_link = fk_link
         super().__init__(**kwargs)
-        self._sp_vals_negative = [
+
+    @cached_property
+    def _sp_vals_negative(self):
+        return [
             PreparedFieldValue(
                 100,
                 f_type=self,
@@ -235,6 +266,9 @@ class ForeignKey(BaseType):
     def generate(self, **kwargs):
         pass
 
+    def generate_many(self, count: int) -> list:
+        return [None] * count
+
 
 @attr.dataclass
 class Field:
@@ -245,19 +279,55 @@ class Field:
     required: bool = False
 
 
-def get_fields(data_class: type, predicate: Callable = None) -> List[Field]:
-    """Get fields by data class and filtered by predicate"""
+class Schema:
+    """
+    Fields registry of data class, built once on data class definition
+    (see BaseClass.__init_subclass__)
+    :attribute fields: all fields in definition order
+    :attribute by_name: fields by field name
+    :attribute fk_fields: FK fields
+    :attribute plain_fields: non-FK fields except "id"
+    :attribute required_fields: required fields
+    :attribute fk_by_link: FK fields by data class they refer to, first one wins
+    :attribute referenced_by: reverse FK map, (data class, FK field) pairs
+                              of later defined data classes referring to this one
+    """
+
+    __slots__ = (
+        "fields",
+        "by_name",
+        "fk_fields",
+        "plain_fields",
+        "required_fields",
+        "fk_by_link",
+        "referenced_by",
+    )
+
+    def __init__(self, data_class: type):
+        self.fields: Tuple[Field, ...] = tuple(
+            value for value in data_class.__dict__.values() if isinstance(value, Field)
+        )
+        self.by_name: Dict[str, Field] = {field.name: field for field in self.fields}
+        self.fk_fields = tuple(field for field in self.fields if is_fk_field(field))
+        self.plain_fields = tuple(
+            field
+            for field in self.fields
+            if field.name != "id" and not is_fk_field(field)
+        )
+        self.required_fields = tuple(field for field in self.fields if field.required)
+        self.fk_by_link: Dict[type, Field] = {}
+        for field in self.fk_fields:
+            self.fk_by_link.setdefault(field.f_type.fk_link, field)
+        self.referenced_by: List[Tuple[type, Field]] = []
+        for field in self.fk_fields:
+            field.f_type.fk_link.schema.referenced_by.append((data_class, field))
 
-    def dummy_predicate(_):
-        return True
 
+def get_fields(data_class: type, predicate: Callable = None) -> List[Field]:
+    """Get fields by data class and filtered by predicate"""
     if predicate is None:
-        predicate = dummy_predicate
-    return [
-        value
-        for (key, value) in data_class.__dict__.items()
-        if isinstance(value, Field) and predicate(value)
-    ]
+        return list(data_class.schema.fields)
+    return [field for field in data_class.schema.fields if predicate(field)]
 
 
 def is_fk_field(field: Field) -> bool:
@@ -267,7 +337,9 @@ def is_fk_field(field: Field) -> bool:
 
 def get_field_name_by_fk_dataclass(data_class: type, fk_data_class: type) -> str:
     """Get field name in data_class that is FK to another data_class"""
-    for field in get_fields(data_class, predicate=is_fk_field):
-        if field.f_type.fk_link == fk_data_class:
-            return field.name
-    raise AttributeError(f"No FK field pointing to {fk_data_class} found!")
+    try:
+        return data_class.schema.fk_by_link[fk_data_class].name
+    except KeyError:
+        raise AttributeError(
+            f"No FK field pointing to {fk_data_class} found!"
+        ) from None
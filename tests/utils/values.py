@@ -0,0 +1,79 @@
+"""Seeded random values generation"""
+import random
+from contextlib import contextmanager
+from string import ascii_letters
+from typing import List, Sequence, Tuple, Union
+
+
+class ValueFactory:
+    """
+    Random values generator with its own seeded random instance
+    Values are generated in bulk: all characters of a batch of strings
+    are taken with one random.choices() call.
+    The same seed gives the same sequence of values, so failed runs can be reproduced
+    """
+
+    __slots__ = ("seed", "_random")
+
+    def __init__(self, seed=None):
+        self.seed = seed
+        self._random = random.Random(seed)
+
+    def reseed(self, seed):
+        """Start new sequence of values from seed"""
+        self.seed = seed
+        self._random.seed(seed)
+
+    @contextmanager
+    def seeded(self, seed):
+        """Temporary reseed factory, previous sequence continues after exit"""
+        state, previous_seed = self._random.getstate(), self.seed
+        self.reseed(seed)
+        try:
+            yield self
+        finally:
+            self.seed = previous_seed
+            self._random.setstate(state)
+
+    def string(self, length=10, alphabet=ascii_letters) -> str:
+        """Random string of given length"""
+        return "".join(self._random.choices(alphabet, k=length))
+
+    def strings(
+        self,
+        count: int,
+        length: Union[int, Tuple[int, int]] = 10,
+        alphabet=ascii_letters,
+    ) -> List[str]:
+        """
+        Batch of random strings
+        :param length: exact length or (min, max) range of random lengths
+        """
+        if isinstance(length, int):
+            lengths = [length] * count
+        else:
+            lengths = self.integers(count, *length)
+        chars = "".join(self._random.choices(alphabet, k=sum(lengths)))
+        result = []
+        position = 0
+        for str_length in lengths:
+            end = position + str_length
+            result.append(chars[position:end])
+            position = end
+        return result
+
+    def integer(self, min_value: int, max_value: int) -> int:
+        """Random int in [min_value, max_value] range"""
+        return self._random.randint(min_value, max_value)
+
+    def integers(self, count: int, min_value: int, max_value: int) -> List[int]:
+        """Batch of random ints in [min_value, max_value] range"""
+        return self._random.choices(range(min_value, max_value + 1), k=count)
+
+    def choice(self, population: Sequence):
+        """Random element of population"""
+        return self._random.choice(population)
+
+
+# Shared factory of the process, seeded per xdist worker in conftest
+values = ValueFactory()